@@ -1,516 +1,1931 @@
-<!DOCTYPE html>
-<html lang="ko">
-<head>
-    <meta charset="UTF-8" />
-    <meta name="viewport" content="width=device-width, initial-scale=1.0"/>
-    <title>Security Insight Pro - Timeline</title>
-    
-    <script src="https://cdn.tailwindcss.com"></script>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.min.js"></script>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/PapaParse/5.4.1/papaparse.min.js"></script>
-    <script src="https://unpkg.com/@phosphor-icons/web"></script>
-    <link rel="stylesheet" as="style" crossorigin href="https://cdn.jsdelivr.net/gh/orioncactus/pretendard@v1.3.8/dist/web/static/pretendard.css" />
-
-    <style>
-        body { font-family: 'Pretendard', sans-serif; background-color: #f0f4f8; color: #1e293b; }
-        ::-webkit-scrollbar { width: 6px; }
-        ::-webkit-scrollbar-track { background: transparent; }
-        ::-webkit-scrollbar-thumb { background: #cbd5e1; border-radius: 4px; }
-        
-        .dashboard-card {
-            background: rgba(255, 255, 255, 0.95);
-            border: 1px solid #e2e8f0;
-            border-radius: 16px;
-            box-shadow: 0 4px 20px rgba(0, 0, 0, 0.03);
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        }
-        .dashboard-card:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 10px 25px rgba(0, 0, 0, 0.06);
-            border-color: #cbd5e1;
-        }
+# -*- coding: utf-8 -*-
+"""Security Insight Pro 뉴스 크롤러.
 
-        /* 그룹 라벨 및 버튼 */
-        .group-label { font-size: 0.7rem; font-weight: 700; color: #64748b; margin-bottom: 6px; text-transform: uppercase; letter-spacing: 0.05em; }
-        .kw-btn {
-            font-size: 0.8rem; padding: 6px 12px; border-radius: 8px; 
-            background: #f1f5f9; color: #475569; border: 1px solid #e2e8f0;
-            transition: all 0.2s; cursor: pointer; font-weight: 500;
-        }
-        .kw-btn:hover { background: #e2e8f0; color: #1e293b; }
-        .kw-btn.active { background: #3b82f6; color: white; border-color: #2563eb; box-shadow: 0 2px 8px rgba(59, 130, 246, 0.3); }
-
-        /* 날짜 라디오 버튼 */
-        .date-radio-group { display: flex; background: #f1f5f9; padding: 4px; border-radius: 10px; border: 1px solid #e2e8f0; }
-        .date-radio-item { flex: 1; text-align: center; }
-        .date-radio-item input { display: none; }
-        .date-radio-item label {
-            display: block; padding: 6px 0; font-size: 0.8rem; font-weight: 600; color: #64748b;
-            cursor: pointer; border-radius: 8px; transition: all 0.2s;
-        }
-        .date-radio-item input:checked + label {
-            background: white; color: #3b82f6; box-shadow: 0 2px 4px rgba(0,0,0,0.05); font-weight: 700;
-        }
+키워드별 뉴스 검색 결과를 수집해 위험도(RED/AMBER/GREEN)를 매기고
+대시보드(index.html)가 읽는 data.csv 를 갱신한다.
+
+    python app.py                      # 기본 키워드 수집
+    python app.py -w 16 -k keywords.txt # 키워드 파일 + 동시 수집 16개
+    python app.py --metrics-file crawl.prom --profile crawl.prof  # 지표 + 프로파일
+    python app.py --render              # templates/index.html 만 고쳤을 때 index.html 다시 만들기
+    python app.py --compact --retention-days 365  # 1년 지난 기사는 일별 집계로만 남기기
+    python app.py -k big.txt --shards 8 # 키워드를 8개 프로세스로 나눠 수집 후 합치기
+    python app.py -k big.txt --shard 0/8  # (서버마다) 샤드 하나씩 수집, 끝나면
+    python app.py -k big.txt --merge 8    # 샤드 결과를 합쳐 data.csv·파티션 갱신
+"""
+import argparse
+import cProfile
+import csv
+import datetime
+import gzip
+import hashlib
+import heapq
+import html
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import random
+import re
+import sqlite3
+import struct
+import sys
+import tempfile
+import threading
+import time
+import unicodedata
+import zlib
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, quote_plus, urlencode, urlparse, urlsplit
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+import dashboard_build
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+log = logging.getLogger("crawler")
+
+KST = datetime.timezone(datetime.timedelta(hours=9))
+
+# 기본 수집 키워드 (KEYWORD_GROUPS 와 맞춰 관리)
+KEYWORDS = [
+    "KT텔레캅", "SK쉴더스", "에스원",
+    "보안 사고", "해킹", "개인정보 유출", "산업 재해",
+]
+
+# 대시보드 키워드 버튼 그룹. index.html 을 만들 때 페이지에 넣어 준다 (dashboard_build.render)
+KEYWORD_GROUPS = {
+    "무인경비": ["KT텔레캅", "에스원", "SK쉴더스", "CCTV", "보안관제"],
+    "통신/테크": ["KT", "SK", "LG", "애플", "아이폰", "갤럭시", "삼성"],
+    "안전/사고": ["안전사고", "산업재해", "화재", "폭발", "중대재해", "붕괴"],
+    "보안/기타": ["해킹", "개인정보", "유출", "랜섬웨어", "보안", "피싱"],
+}
+
+SEARCH_URL = "https://search.naver.com/search.naver?where=news&sort=1&query={query}"
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+DATA_FILE = "data.csv"
+# rules: 위험도 판정에 걸린 규칙 용어 ("|" 로 구분)
+# cluster_id: 같은 사건을 다룬 유사 제목 기사 묶음 (묶음을 처음 연 기사의 링크 해시)
+FIELDS = ["keyword", "title", "link", "date", "risk", "rules", "cluster_id"]
+MAX_ITEMS_PER_KEYWORD = 3
+
+# 위험도 판정 규칙 (용어별 가중치와 등급 기준)
+RISK_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "risk_rules.json")
+
+# 동시성 기본값
+DEFAULT_WORKERS = 8
+PER_HOST_LIMIT = 4
+RATE_LIMIT = 10.0  # 초당 요청 수 (전체)
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+TIMEOUT = 10
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# 기사 본문 보강 (--enrich)
+ENRICH_FILE = "articles.jsonl"
+ENRICH_PROCESSES = os.cpu_count() or 2
+ENRICH_PER_HOST = 2
+ENRICH_HOST_DELAY = 0.5  # 같은 언론사에 연속 요청할 때 최소 간격(초)
+LEAD_MAX_CHARS = 300
+
+# 조건부 요청용 수집 캐시
+CACHE_FILE = os.path.join(".cache", "fetch_cache.json")
+CACHE_MAX_ENTRIES = 5000
+
+# --compact 외부 정렬: 한 번에 메모리에 올리는 행 수와 한 번에 합치는 run 파일 수
+COMPACT_CHUNK_ROWS = 20000
+COMPACT_FAN_IN = 64
+
+# 중복 제거 색인 (data.csv 에서 언제든 다시 만들 수 있으므로 캐시 폴더에 둔다)
+INDEX_FILE = os.path.join(".cache", "dedup_index.db")
+# 링크에서 버리는 추적용 파라미터. sid/from 처럼 언론사 CMS 가 기사·섹션 번호로도 쓰는
+# 이름은 넣지 않는다 (다른 기사가 같은 키로 합쳐진다)
+TRACKING_PARAMS = {"f", "ref", "fbclid", "gclid", "rc", "ncid"}
+
+# 유사 기사 묶기 (제목 글자 2-gram MinHash + LSH)
+MINHASH_SIZE = 32
+LSH_BANDS = 8            # 밴드당 4개 -> 자카드 유사도 약 0.6 부터 후보로 잡힌다
+CLUSTER_THRESHOLD = 0.5  # 서명 일치 비율이 이 이상이면 같은 묶음
+CLUSTER_WINDOW_DAYS = 14  # 이 기간 안의 기사끼리만 묶는다
+_MERSENNE = (1 << 61) - 1
+_MINHASH_PARAMS = [
+    (int.from_bytes(hashlib.sha1(b"a%d" % i).digest()[:8], "big") % _MERSENNE | 1,
+     int.from_bytes(hashlib.sha1(b"b%d" % i).digest()[:8], "big") % _MERSENNE)
+    for i in range(MINHASH_SIZE)
+]
+
+# 대시보드가 기간별로 나눠 받는 일자별 파티션
+PARTITION_DIR = "data"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 6
+# 보존 기간(--retention-days)이 지나 data.csv 에서 뺀 날의 (키워드 x 위험도) 일별 집계.
+# 한 줄에 하루씩 최신 날짜부터 쓰고, 대시보드는 기간이 거기까지 걸칠 때만 받는다
+ROLLUP_NAME = "rollups.jsonl"
+RISK_LEVELS = ["RED", "AMBER", "GREEN"]
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+# rebuild_partitions 가 지워도 되는 파일 (일자별 파티션 CSV·검색 색인·묶음)
+PARTITION_FILE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}\.(csv|idx\.json|bin)$")
+
+# 파티션마다 CSV 와 함께 쓰는 열 단위 묶음 (build_bundle)
+BUNDLE_MAGIC = b"NWB1"
+BUNDLE_TEXT_FIELDS = ["title", "link", "rules", "cluster_id"]
+BUNDLE_INVALID_DAY = -(1 << 31)
+EPOCH = datetime.date(1970, 1, 1)
+
+# 대시보드 (templates/index.html -> index.html, dashboard_build.py)
+SITE_DIR = "."
+
+# 수집 실행 보고서 (파티션 폴더에 두고 대시보드 '파이프라인 상태' 패널이 읽는다)
+REPORT_NAME = "run_report.json"
+REPORT_VERSION = 1
+REPORT_STAGES = ["crawl", "fetch", "parse", "classify", "merge", "dedup", "enrich", "write"]
+METRIC_PREFIX = "news_crawler"
+
+# 샤드 수집 (--shard i/N 으로 나눠 돌리고 --merge N 으로 합친다, --shards N 은 한 번에)
+SHARD_DIR = os.path.join(".cache", "shards")
+
+
+class RateLimiter:
+    """전체 요청에 적용되는 토큰 버킷."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class Fetcher:
+    """keep-alive 세션을 공유하는 HTTP 클라이언트.
+
+    호스트별 동시 요청 수와 전체 초당 요청 수를 제한하고, 네트워크 오류와
+    RETRY_STATUS 응답은 지수 백오프로 재시도한다. host_delay 를 주면 같은
+    호스트에는 그 간격 이상을 두고 요청한다.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, per_host: int = PER_HOST_LIMIT,
+                 rate: float = RATE_LIMIT, retries: int = MAX_RETRIES,
+                 backoff: float = BACKOFF_BASE, timeout: float = TIMEOUT,
+                 host_delay: float = 0):
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.per_host = per_host
+        self.limiter = RateLimiter(rate)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.host_delay = host_delay
+        self._host_next: Dict[str, float] = {}
+        self._hosts: Dict[str, threading.BoundedSemaphore] = {}
+        self._hosts_lock = threading.Lock()
+        # 실행 보고서용 누적 지표 (status_counts 의 "error" 는 응답 없이 끝난 요청)
+        self.status_counts: Dict[str, int] = {}
+        self.retried = 0
+        self.bytes_downloaded = 0
+        self._stats_lock = threading.Lock()
+
+    def _record(self, status: str, size: int = 0):
+        with self._stats_lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+            self.bytes_downloaded += size
 
-        /* 뱃지 */
-        .badge { padding: 3px 8px; border-radius: 6px; font-size: 0.65rem; font-weight: 700; text-transform: uppercase; }
-        .badge-RED { background: #fee2e2; color: #991b1b; border: 1px solid #fecaca; }
-        .badge-AMBER { background: #fef3c7; color: #92400e; border: 1px solid #fde68a; }
-        .badge-GREEN { background: #dcfce7; color: #166534; border: 1px solid #bbf7d0; }
-        
-        /* NEW 뱃지 */
-        .badge-new { 
-            background: #ef4444; color: white; font-size: 0.6rem; padding: 2px 6px; 
-            border-radius: 4px; font-weight: 800; animation: pulse 2s infinite; 
-            display: inline-flex; align-items: center; gap: 2px;
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._hosts_lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.per_host)
+            return self._hosts[host]
+
+    def _wait_host_turn(self, url: str):
+        if self.host_delay <= 0:
+            return
+        host = urlparse(url).netloc
+        with self._hosts_lock:
+            now = time.monotonic()
+            turn = max(now, self._host_next.get(host, 0.0))
+            self._host_next[host] = turn + self.host_delay
+        if turn > now:
+            time.sleep(turn - now)
+
+    def get(self, url: str, **kwargs) -> Optional[requests.Response]:
+        slot = self._host_slot(url)
+        for attempt in range(self.retries + 1):
+            if attempt:
+                with self._stats_lock:
+                    self.retried += 1
+            self._wait_host_turn(url)
+            self.limiter.acquire()
+            try:
+                with slot:
+                    resp = self.session.get(url, timeout=self.timeout, **kwargs)
+                self._record(str(resp.status_code), len(resp.content))
+                if resp.status_code not in RETRY_STATUS:
+                    return resp
+                log.warning("%s -> HTTP %s (시도 %d)", url, resp.status_code, attempt + 1)
+            except requests.RequestException as e:
+                self._record("error")
+                log.warning("%s -> %s (시도 %d)", url, e, attempt + 1)
+            if attempt < self.retries:
+                time.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+        return None
+
+    def close(self):
+        self.session.close()
+
+
+class FetchCache:
+    """URL 별 ETag/Last-Modified 와 본문 해시, 파싱 결과를 보관하는 디스크 캐시.
+
+    서버가 304 를 주거나 본문 해시가 같으면 저장된 파싱 결과를 그대로 쓴다.
+    max_entries 를 넘으면 가장 오래 쓰이지 않은 항목부터 버린다.
+    """
+
+    def __init__(self, path: str = CACHE_FILE, max_entries: int = CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            log.warning("캐시 파일을 읽지 못해 새로 시작합니다: %s", e)
+            return
+        self.entries = OrderedDict((e["url"], e) for e in data.get("entries", []))
+
+    def get(self, url: str) -> Optional[dict]:
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is not None:
+                self.entries.move_to_end(url)
+            return entry
+
+    @staticmethod
+    def conditional_headers(entry: Optional[dict]) -> Dict[str, str]:
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, url: str, resp: requests.Response, digest: str, items: List[dict]):
+        entry = {
+            "url": url,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "hash": digest,
+            "items": items,
         }
-        @keyframes pulse { 0% { opacity: 1; } 50% { opacity: 0.7; } 100% { opacity: 1; } }
-
-        #loader { position: fixed; inset: 0; background: rgba(255,255,255,0.9); z-index: 9999; display: flex; flex-direction: column; justify-content: center; align-items: center; backdrop-filter: blur(5px); }
-    </style>
-</head>
-
-<body class="antialiased">
-
-    <div id="loader">
-        <div class="animate-spin rounded-full h-12 w-12 border-b-2 border-blue-600 mb-4"></div>
-        <p class="text-slate-600 font-bold animate-pulse">데이터 분석 중...</p>
-    </div>
-
-    <nav class="bg-slate-900 text-white h-16 sticky top-0 z-50 shadow-xl backdrop-blur-md bg-opacity-95 border-b border-slate-700">
-        <div class="max-w-7xl mx-auto px-6 h-full flex items-center justify-between">
-            <div class="flex items-center gap-3">
-                <div class="bg-blue-600 p-1.5 rounded-lg">
-                    <i class="ph-bold ph-shield-check text-xl"></i>
-                </div>
-                <div>
-                    <h1 class="font-bold text-lg tracking-tight leading-none">Security Insight <span class="text-blue-400">Pro</span></h1>
-                    <p class="text-[10px] text-slate-400 font-medium tracking-wider mt-0.5">INTELLIGENCE DASHBOARD</p>
-                </div>
-            </div>
-            <div class="flex items-center gap-3">
-                <div class="hidden md:flex items-center gap-2 text-xs bg-slate-800 px-3 py-1.5 rounded-full border border-slate-600 text-slate-300">
-                    <span class="relative flex h-2 w-2">
-                      <span class="animate-ping absolute inline-flex h-full w-full rounded-full bg-green-400 opacity-75"></span>
-                      <span class="relative inline-flex rounded-full h-2 w-2 bg-green-500"></span>
-                    </span>
-                    Live System
-                </div>
-            </div>
-        </div>
-    </nav>
-
-    <div class="max-w-7xl mx-auto p-6 space-y-6">
-
-        <div class="dashboard-card p-0 overflow-hidden border-none relative shadow-lg">
-            <div class="bg-gradient-to-r from-slate-800 to-slate-900 p-6 text-white relative z-10">
-                <div class="flex flex-col md:flex-row gap-6 items-start">
-                    <div class="shrink-0 p-3 bg-white/10 rounded-xl backdrop-blur-md border border-white/10">
-                        <i class="ph-duotone ph-robot text-3xl text-blue-300"></i>
-                    </div>
-                    <div class="flex-1 w-full">
-                        <h2 class="font-bold text-lg mb-3 flex items-center gap-2 text-blue-100 border-b border-white/10 pb-2">
-                            AI Executive Briefing
-                            <span class="text-[10px] bg-blue-600 text-white px-2 py-0.5 rounded-full shadow-sm">Analysis Ready</span>
-                        </h2>
-                        <div id="ai-summary-content" class="text-slate-300 text-sm leading-relaxed space-y-3">
-                            <p class="animate-pulse">데이터를 분석하고 있습니다...</p>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            <div class="absolute top-0 right-0 w-96 h-full bg-blue-500 opacity-10 blur-3xl transform translate-x-1/3 pointer-events-none"></div>
-        </div>
-
-        <div class="grid grid-cols-2 md:grid-cols-4 gap-4">
-            <div class="dashboard-card p-5 border-l-4 border-blue-500">
-                <div class="flex justify-between items-start mb-2">
-                    <span class="text-xs font-bold text-slate-500 uppercase tracking-wider">Collected</span>
-                    <i class="ph-duotone ph-newspaper text-2xl text-blue-500/50"></i>
-                </div>
-                <h3 id="kpi-total" class="text-3xl font-bold text-slate-800">-</h3>
-            </div>
-            <div class="dashboard-card p-5 border-l-4 border-red-500">
-                <div class="flex justify-between items-start mb-2">
-                    <span class="text-xs font-bold text-red-600 uppercase tracking-wider">Critical</span>
-                    <i class="ph-duotone ph-warning-octagon text-2xl text-red-500/50"></i>
-                </div>
-                <h3 id="kpi-red" class="text-3xl font-bold text-red-600">-</h3>
-            </div>
-            <div class="dashboard-card p-5 border-l-4 border-amber-500">
-                <div class="flex justify-between items-start mb-2">
-                    <span class="text-xs font-bold text-amber-600 uppercase tracking-wider">Warning</span>
-                    <i class="ph-duotone ph-siren text-2xl text-amber-500/50"></i>
-                </div>
-                <h3 id="kpi-amber" class="text-3xl font-bold text-amber-600">-</h3>
-            </div>
-            <div class="dashboard-card p-5 border-l-4 border-green-500">
-                <div class="flex justify-between items-start mb-2">
-                    <span class="text-xs font-bold text-green-600 uppercase tracking-wider">Main Topic</span>
-                    <i class="ph-duotone ph-trend-up text-2xl text-green-500/50"></i>
-                </div>
-                <h3 id="kpi-keyword" class="text-lg font-bold text-green-700 mt-2 truncate">-</h3>
-            </div>
-        </div>
-
-        <div class="grid grid-cols-1 lg:grid-cols-12 gap-6">
-            
-            <div class="lg:col-span-4 space-y-6">
-                
-                <div class="dashboard-card p-5 sticky top-20 z-30">
-                    <div class="flex items-center justify-between mb-4 pb-2 border-b border-slate-100">
-                        <h3 class="font-bold text-sm text-slate-800 flex items-center gap-2">
-                            <i class="ph-bold ph-funnel text-slate-500"></i> Smart Filter
-                        </h3>
-                        <button onclick="resetFilter()" class="text-xs text-slate-400 hover:text-blue-500 underline">초기화</button>
-                    </div>
-
-                    <div class="mb-5">
-                        <label class="block text-xs font-bold text-slate-400 mb-2">TIMELINE</label>
-                        <div class="date-radio-group">
-                            <div class="date-radio-item">
-                                <input type="radio" id="d-1" name="date-range" value="1" onchange="setDateFilter('1')">
-                                <label for="d-1">오늘</label>
-                            </div>
-                            <div class="date-radio-item">
-                                <input type="radio" id="d-3" name="date-range" value="3" onchange="setDateFilter('3')">
-                                <label for="d-3">3일</label>
-                            </div>
-                            <div class="date-radio-item">
-                                <input type="radio" id="d-7" name="date-range" value="7" checked onchange="setDateFilter('7')">
-                                <label for="d-7">7일</label>
-                            </div>
-                            <div class="date-radio-item">
-                                <input type="radio" id="d-all" name="date-range" value="ALL" onchange="setDateFilter('ALL')">
-                                <label for="d-all">전체</label>
-                            </div>
-                        </div>
-                    </div>
-
-                    <div class="space-y-4" id="group-filter-container"></div>
-
-                    <div class="mt-6 pt-4 border-t border-slate-100">
-                        <label class="block text-xs font-bold text-slate-400 mb-2">SEARCH</label>
-                        <div class="relative">
-                            <i class="ph-bold ph-magnifying-glass absolute left-3 top-2.5 text-slate-400"></i>
-                            <input id="filter-search" type="text" placeholder="제목/키워드 검색..." class="w-full pl-9 pr-3 py-2 bg-slate-50 border border-slate-200 rounded-lg text-sm focus:border-blue-500 outline-none transition-all">
-                        </div>
-                    </div>
-                </div>
-
-                <div class="dashboard-card p-5">
-                    <h3 class="font-bold text-xs text-slate-500 uppercase mb-4 flex items-center gap-2">
-                        <i class="ph-fill ph-chart-pie-slice"></i> Risk Share
-                    </h3>
-                    <div class="h-48 relative"><canvas id="riskChart"></canvas></div>
-                </div>
-            </div>
-
-            <div class="lg:col-span-8">
-                <div class="flex items-end justify-between mb-4 px-1">
-                    <h3 class="font-bold text-lg text-slate-800 flex items-center gap-2">
-                        News Feed
-                        <span id="list-count" class="text-xs font-bold bg-white border border-slate-200 px-2 py-0.5 rounded text-slate-500 shadow-sm">0</span>
-                    </h3>
-                    <span id="current-period-text" class="text-xs font-bold text-blue-600 bg-blue-50 px-3 py-1 rounded-full">최근 7일</span>
-                </div>
-                <div id="news-list" class="space-y-3"></div>
-            </div>
-        </div>
-
-        <footer class="text-center text-xs text-slate-400 py-8 border-t border-slate-200 mt-8">
-            &copy; 2025 Security Insight Pro. Powered by Automated Intelligence.
-        </footer>
-    </div>
-
-    <script>
-        const KEYWORD_GROUPS = {
-            "무인경비": ["KT텔레캅", "에스원", "SK쉴더스", "CCTV", "보안관제"],
-            "통신/테크": ["KT", "SK", "LG", "애플", "아이폰", "갤럭시", "삼성"],
-            "안전/사고": ["안전사고", "산업재해", "화재", "폭발", "중대재해", "붕괴"],
-            "보안/기타": ["해킹", "개인정보", "유출", "랜섬웨어", "보안", "피싱"]
-        };
-
-        let rawData = [];
-        let filteredData = [];
-        let charts = {};
-        let currentKeywordFilter = "ALL";
-        let currentDateRange = "7";
-
-        // 1. 데이터 로드
-        Papa.parse("data.csv", {
-            download: true,
-            header: true,
-            skipEmptyLines: true,
-            complete: function(results) {
-                rawData = results.data
-                    .map(item => {
-                        const dateStr = item.date_fmt || item.date || "";
-                        return {
-                            keyword: item.keyword ? item.keyword.trim() : "기타",
-                            title: item.title ? item.title.trim() : "",
-                            link: (item.link && item.link.trim()) ? item.link.trim() : "#",
-                            date: dateStr,
-                            risk: item.risk ? item.risk.trim().toUpperCase() : "GREEN",
-                            dateObj: new Date(dateStr)
-                        };
-                    })
-                    .filter(item => item.title && !isNaN(item.dateObj)); 
-
-                // 날짜 내림차순 정렬 (최신순)
-                rawData.sort((a, b) => b.dateObj - a.dateObj);
-                
-                document.getElementById("loader").style.display = "none";
-                
-                renderGroupButtons();
-                applyFilter();
+        with self.lock:
+            self.entries[url] = entry
+            self.entries.move_to_end(url)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def record(self, hit: bool):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with self.lock:
+            data = {"entries": list(self.entries.values())}
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+def peak_rss() -> Optional[int]:
+    """이 프로세스의 최대 상주 메모리(바이트). resource 모듈이 없으면 None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # macOS 는 바이트, 그 외 KB
+
+
+def _prom_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class RunReport:
+    """수집 한 번의 단계별 소요 시간과 수집 지표.
+
+    stage() 로 감싼 구간의 시간을 단계 이름별로 더한다. fetch/parse/classify 는
+    수집 스레드들에서 동시에 돌므로 벽시계 시간이 아니라 스레드별 시간의 합이고,
+    crawl 이 그 구간 전체의 벽시계 시간이다.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.datetime.now(KST).isoformat(timespec="seconds")
+        self.started = time.perf_counter()
+        self.stages: Dict[str, list] = {}  # REPORT_STAGES 이름 -> [초, 횟수]
+        self.items: Dict[str, int] = {}
+        self.counts: Dict[str, int] = {}
+        self.http: Dict[str, int] = {}
+        self.retries = 0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.error: Optional[str] = None
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t
+            with self.lock:
+                total = self.stages.setdefault(name, [0.0, 0])
+                total[0] += elapsed
+                total[1] += 1
+
+    def count(self, name: str, n: int = 1):
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + n
+
+    def add_fetcher(self, fetcher: Fetcher):
+        with fetcher._stats_lock:
+            for status, n in fetcher.status_counts.items():
+                self.http[status] = self.http.get(status, 0) + n
+            self.retries += fetcher.retried
+            self.bytes += fetcher.bytes_downloaded
+
+    def add_cache(self, cache: FetchCache):
+        self.cache_hits += cache.hits
+        self.cache_misses += cache.misses
+
+    def add_report(self, other: dict):
+        """다른 프로세스(샤드)의 보고서를 더한다. 단계 시간은 샤드별 시간의 합이 된다."""
+        with self.lock:
+            for name, stage in other["stages"].items():
+                total = self.stages.setdefault(name, [0.0, 0])
+                total[0] += stage["seconds"]
+                total[1] += stage["calls"]
+            for name, n in other["counts"].items():
+                self.counts[name] = self.counts.get(name, 0) + n
+            for status, n in other["http"]["status"].items():
+                self.http[status] = self.http.get(status, 0) + n
+            self.retries += other["http"]["retries"]
+            self.bytes += other["http"]["bytes"]
+            self.cache_hits += other["cache"]["hits"]
+            self.cache_misses += other["cache"]["misses"]
+            self.items.update(other["keywords"])
+            if other["error"] and not self.error:
+                self.error = other["error"]
+
+    def status(self) -> str:
+        if self.error or not self.counts.get("rows_collected"):
+            return "failed"
+        return "degraded" if self.counts.get("keywords_failed") else "ok"
+
+    def to_dict(self) -> dict:
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "version": REPORT_VERSION,
+            "status": self.status(),
+            "started": self.started_at,
+            "finished": datetime.datetime.now(KST).isoformat(timespec="seconds"),
+            "duration": round(time.perf_counter() - self.started, 3),
+            "stages": {name: {"seconds": round(self.stages[name][0], 3),
+                              "calls": self.stages[name][1]}
+                       for name in REPORT_STAGES if name in self.stages},
+            "http": {
+                "requests": sum(self.http.values()),
+                "status": dict(sorted(self.http.items())),
+                "retries": self.retries,
+                "bytes": self.bytes,
+            },
+            "cache": {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "hit_rate": round(self.cache_hits / lookups, 4) if lookups else None,
             },
-            error: function(err) {
-                document.getElementById("loader").style.display = "none";
-                document.getElementById("ai-summary-content").innerHTML = "<span class='text-red-400'>데이터 로드 실패. CSV 파일을 확인해주세요.</span>";
-            }
-        });
-
-        // 2. 그룹 버튼 렌더링
-        function renderGroupButtons() {
-            const container = document.getElementById("group-filter-container");
-            container.innerHTML = "";
-            const presentKeywords = new Set(rawData.map(d => d.keyword));
-
-            Object.keys(KEYWORD_GROUPS).forEach(groupName => {
-                const groupKeywords = KEYWORD_GROUPS[groupName].filter(k => 
-                    [...presentKeywords].some(pk => pk.includes(k) || k.includes(pk))
-                );
-
-                if (groupKeywords.length > 0) {
-                    const groupDiv = document.createElement("div");
-                    
-                    const label = document.createElement("div");
-                    label.className = "group-label";
-                    label.textContent = groupName;
-                    groupDiv.appendChild(label);
-
-                    const btnWrap = document.createElement("div");
-                    btnWrap.className = "flex flex-wrap gap-2";
-
-                    const groupBtn = document.createElement("button");
-                    groupBtn.className = "kw-btn";
-                    groupBtn.dataset.val = `GROUP:${groupName}`;
-                    groupBtn.textContent = "전체";
-                    groupBtn.onclick = () => setKeywordFilter(`GROUP:${groupName}`, groupBtn);
-                    btnWrap.appendChild(groupBtn);
-
-                    groupKeywords.forEach(kw => {
-                        const isExist = [...presentKeywords].some(pk => pk.includes(kw) || kw.includes(pk));
-                        if(isExist) {
-                            const btn = document.createElement("button");
-                            btn.className = "kw-btn";
-                            btn.dataset.val = kw;
-                            btn.textContent = kw;
-                            btn.onclick = () => setKeywordFilter(kw, btn);
-                            btnWrap.appendChild(btn);
-                        }
-                    });
-                    groupDiv.appendChild(btnWrap);
-                    container.appendChild(groupDiv);
-                }
-            });
+            "keywords": self.items,
+            "counts": dict(sorted(self.counts.items())),
+            "peak_rss": peak_rss(),
+            "error": self.error,
         }
 
-        // 3. 필터 제어
-        function setKeywordFilter(val, btnElement) {
-            currentKeywordFilter = val;
-            document.querySelectorAll('.kw-btn').forEach(b => b.classList.remove('active'));
-            if(btnElement) btnElement.classList.add('active');
-            applyFilter();
-        }
+    def save(self, path: str, report: Optional[dict] = None):
+        report = report or self.to_dict()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, path)
 
-        function setDateFilter(val) {
-            currentDateRange = val;
-            const textMap = {"1": "오늘 (24h)", "3": "최근 3일", "7": "최근 7일", "ALL": "전체 기간"};
-            document.getElementById("current-period-text").textContent = textMap[val];
-            applyFilter();
-        }
+    @staticmethod
+    def prometheus(report: dict) -> str:
+        """node_exporter textfile collector 형식으로 바꾼다."""
+        lines = []
 
-        function resetFilter() {
-            currentKeywordFilter = "ALL";
-            currentDateRange = "7"; 
-            document.getElementById("filter-search").value = "";
-            document.querySelectorAll('.kw-btn').forEach(b => b.classList.remove('active'));
-            document.querySelector('input[name="date-range"][value="7"]').checked = true;
-            document.getElementById("current-period-text").textContent = "최근 7일";
-            applyFilter();
-        }
+        def metric(name, kind, help_text, samples):
+            name = "%s_%s" % (METRIC_PREFIX, name)
+            lines.append("# HELP %s %s" % (name, help_text))
+            lines.append("# TYPE %s %s" % (name, kind))
+            for labels, value in samples:
+                label = ",".join('%s="%s"' % (k, _prom_label(str(v))) for k, v in labels)
+                lines.append("%s%s %s" % (name, "{%s}" % label if label else "", value))
 
-        function applyFilter() {
-            const searchVal = document.getElementById("filter-search").value.toLowerCase();
-            const today = new Date();
-            let dateCutoff = null;
-            
-            // 날짜 비교 (자정 기준)
-            today.setHours(0,0,0,0);
-
-            if (currentDateRange !== "ALL") {
-                dateCutoff = new Date(today);
-                dateCutoff.setDate(today.getDate() - (parseInt(currentDateRange) - 1));
-            }
-
-            filteredData = rawData.filter(item => {
-                if (dateCutoff && item.dateObj < dateCutoff) return false;
-                
-                let groupMatch = true;
-                if (currentKeywordFilter.startsWith("GROUP:")) {
-                    const groupName = currentKeywordFilter.split(":")[1];
-                    const keywords = KEYWORD_GROUPS[groupName];
-                    groupMatch = keywords.some(k => item.keyword.includes(k) || k.includes(item.keyword));
-                } else if (currentKeywordFilter !== "ALL") {
-                    groupMatch = item.keyword.includes(currentKeywordFilter) || currentKeywordFilter.includes(item.keyword);
-                }
-
-                const searchMatch = item.title.toLowerCase().includes(searchVal) || 
-                                    item.keyword.toLowerCase().includes(searchVal);
-                return groupMatch && searchMatch;
-            });
-
-            renderDashboard();
-        }
+        finished = datetime.datetime.fromisoformat(report["finished"]).timestamp()
+        metric("last_run_timestamp_seconds", "gauge", "수집 종료 시각", [((), int(finished))])
+        metric("run_success", "gauge", "수집 성공 여부 (failed 면 0)",
+               [((), int(report["status"] != "failed"))])
+        metric("run_duration_seconds", "gauge", "수집 전체 소요 시간", [((), report["duration"])])
+        metric("stage_seconds", "gauge", "단계별 소요 시간",
+               [((("stage", k),), v["seconds"]) for k, v in report["stages"].items()])
+        metric("http_responses", "gauge", "상태 코드별 HTTP 응답 수",
+               [((("status", k),), v) for k, v in report["http"]["status"].items()])
+        metric("http_retries", "gauge", "재시도 횟수", [((), report["http"]["retries"])])
+        metric("http_bytes", "gauge", "내려받은 바이트", [((), report["http"]["bytes"])])
+        if report["cache"]["hit_rate"] is not None:
+            metric("cache_hit_ratio", "gauge", "수집 캐시 적중률", [((), report["cache"]["hit_rate"])])
+        metric("keyword_items", "gauge", "키워드별 수집 건수",
+               [((("keyword", k),), v) for k, v in report["keywords"].items()])
+        counts = report["counts"]
+        metric("rows", "gauge", "수집/신규/보강 행 수",
+               [((("kind", k[5:]),), v) for k, v in counts.items() if k.startswith("rows_")])
+        metric("keywords_failed", "gauge", "수집에 실패한 키워드 수",
+               [((), counts.get("keywords_failed", 0))])
+        if report["peak_rss"] is not None:
+            metric("peak_rss_bytes", "gauge", "최대 상주 메모리", [((), report["peak_rss"])])
+        return "\n".join(lines) + "\n"
 
-        // 4. 렌더링
-        function renderDashboard() {
-            const data = filteredData;
-            const total = data.length;
-            const redCount = data.filter(d => d.risk === 'RED').length;
-            const amberCount = data.filter(d => d.risk === 'AMBER').length;
-            
-            // AI Summary
-            const summaryContainer = document.getElementById("ai-summary-content");
-            let summaryHTML = "";
-
-            if (total === 0) {
-                summaryHTML = `<p class="text-slate-400">🔍 선택된 조건에 맞는 데이터가 없습니다.</p>`;
-            } else {
-                const kwCounts = {};
-                data.forEach(d => kwCounts[d.keyword] = (kwCounts[d.keyword]||0)+1);
-                const topKw = Object.entries(kwCounts).sort((a,b)=>b[1]-a[1])[0][0];
-                
-                const criticalItems = data.filter(d => d.risk === 'RED');
-                const uniqueCriticals = [];
-                const seenTitles = new Set();
-                criticalItems.forEach(d => {
-                    if(!seenTitles.has(d.title)) { seenTitles.add(d.title); uniqueCriticals.push(d); }
-                });
-
-                let statusMsg = "", statusColor = "text-green-400";
-                if (redCount > 2) { statusMsg = "🚨 [심각] 다수의 위협이 탐지되었습니다."; statusColor = "text-red-400 font-bold"; }
-                else if (redCount > 0) { statusMsg = "⚠️ [주의] 위협 요소 모니터링 필요."; statusColor = "text-amber-400 font-bold"; }
-                else { statusMsg = "✅ [안정] 특이사항 없습니다."; }
-
-                summaryHTML += `<p class="mb-3 ${statusColor}">${statusMsg}</p>`;
-                summaryHTML += `<p class="mb-3">선택 기간 총 <strong>${total}건</strong>, <span class="text-blue-200">"${topKw}"</span> 이슈 우세.</p>`;
-
-                if (uniqueCriticals.length > 0) {
-                    summaryHTML += `<div class="bg-white/5 rounded-lg p-3 border border-white/10 mt-2">
-                        <p class="text-xs text-red-300 font-bold mb-2 uppercase">🔴 주요 위협 브리핑</p>
-                        <ul class="space-y-1 text-sm text-slate-300 list-disc list-inside">`;
-                    uniqueCriticals.slice(0, 3).forEach(item => {
-                        summaryHTML += `<li>${item.title.substring(0, 45)}${item.title.length>45?'...':''}</li>`;
-                    });
-                    summaryHTML += `</ul></div>`;
-                }
-            }
-            summaryContainer.innerHTML = summaryHTML;
-
-            // KPIs
-            document.getElementById("kpi-total").textContent = total.toLocaleString();
-            document.getElementById("kpi-red").textContent = redCount;
-            document.getElementById("kpi-amber").textContent = amberCount;
-            
-            const kwCounts = {};
-            data.forEach(d => kwCounts[d.keyword] = (kwCounts[d.keyword]||0)+1);
-            const topKw = Object.entries(kwCounts).sort((a,b)=>b[1]-a[1])[0]?.[0] || "-";
-            document.getElementById("kpi-keyword").textContent = topKw;
-            document.getElementById("list-count").textContent = total;
-
-            // List Render
-            const listContainer = document.getElementById("news-list");
-            listContainer.innerHTML = "";
-            const displayedTitles = new Set();
-
-            // 오늘 날짜 문자열 (YYYY-MM-DD)
-            const todayStr = new Date().toISOString().split('T')[0];
-
-            if (total === 0) {
-                listContainer.innerHTML = `<div class="text-center py-12 text-slate-400 border-2 border-dashed border-slate-200 rounded-xl">데이터가 없습니다.</div>`;
-            } else {
-                data.forEach(d => {
-                    if(displayedTitles.has(d.title)) return;
-                    displayedTitles.add(d.title);
-
-                    const el = document.createElement("a");
-                    el.href = d.link; el.target = "_blank";
-                    el.className = "block dashboard-card p-5 group no-underline relative overflow-hidden mb-3 hover:border-blue-400";
-                    const badgeClass = `badge-${d.risk}`;
-                    
-                    // NEW 뱃지 로직
-                    const isToday = d.date === todayStr;
-                    const newBadge = isToday ? `<span class="badge-new">NEW</span>` : "";
-
-                    el.innerHTML = `
-                        <div class="flex justify-between items-start gap-3 relative z-10">
-                            <div class="flex-1 min-w-0">
-                                <div class="flex items-center gap-2 mb-2 flex-wrap">
-                                    <span class="badge ${badgeClass}">${d.risk}</span>
-                                    <span class="text-[10px] font-bold text-slate-500 bg-slate-100 px-2 py-0.5 rounded border border-slate-200 tracking-wide">${d.keyword}</span>
-                                    ${newBadge}
-                                </div>
-                                <h4 class="font-bold text-slate-800 text-base leading-snug group-hover:text-blue-600 transition-colors line-clamp-2">${d.title}</h4>
-                                <div class="mt-2 text-xs text-slate-400 flex items-center gap-2 font-mono">
-                                    <i class="ph-bold ph-calendar-blank"></i> 
-                                    <span class="font-bold text-slate-500">보도일자: ${d.date}</span>
-                                </div>
-                            </div>
-                            <div class="bg-slate-50 p-2 rounded-lg group-hover:bg-blue-50 transition-colors self-center">
-                                <i class="ph-bold ph-arrow-up-right text-slate-400 group-hover:text-blue-500"></i>
-                            </div>
-                        </div>
-                    `;
-                    listContainer.appendChild(el);
-                });
-            }
-            updateCharts(data);
-        }
+    def write_prometheus(self, path: str, report: Optional[dict] = None):
+        # textfile collector 가 쓰다 만 파일을 읽지 않도록 바꿔치기로 쓴다
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus(report or self.to_dict()))
+        os.replace(tmp, path)
+
+
+def _stage(report: Optional[RunReport], name: str):
+    return report.stage(name) if report else nullcontext()
+
+
+class Classification(NamedTuple):
+    risk: str
+    score: float
+    rules: Tuple[str, ...]
+
+
+class RiskClassifier:
+    """규칙 용어 전체를 Aho-Corasick 오토마톤 하나로 묶은 위험도 분류기.
+
+    본문을 한 번 훑으며 걸린 용어(같은 용어는 한 번)의 가중치를 더하고,
+    thresholds 중 넘는 가장 높은 등급을 매긴다. 비용은 본문 길이에 비례하고
+    규칙 수와는 무관하다.
+    """
+
+    def __init__(self, rules: Dict[str, float], thresholds: Dict[str, float]):
+        self.weights = {term.lower(): weight for term, weight in rules.items() if term}
+        self.thresholds = sorted(thresholds.items(), key=lambda kv: kv[1], reverse=True)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[Tuple[str, ...]] = [()]
+        for term in self.weights:
+            state = 0
+            for ch in term:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = self._goto[state][ch] = len(self._goto)
+                    self._goto.append({})
+                    self._out.append(())
+                state = nxt
+            self._out[state] = (term,)
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                if state:
+                    fail = self._fail[state]
+                    while fail and ch not in self._goto[fail]:
+                        fail = self._fail[fail]
+                    self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+        # (상태, 글자) -> 다음 상태. 실패 링크를 따라간 결과를 처음 본 순간 채워 둔다
+        self._delta: List[Dict[str, int]] = [dict(g) for g in self._goto]
+
+    @classmethod
+    def from_file(cls, path: str = RISK_RULES_FILE) -> "RiskClassifier":
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+        return cls(config["rules"], config["thresholds"])
+
+    def _step(self, state: int, ch: str) -> int:
+        s = state
+        while True:
+            nxt = self._goto[s].get(ch)
+            if nxt is not None or s == 0:
+                nxt = nxt or 0
+                break
+            s = self._fail[s]
+        self._delta[state][ch] = nxt
+        return nxt
+
+    def _grade(self, fired: List[str]) -> Classification:
+        score = sum(self.weights[t] for t in fired)
+        for risk, threshold in self.thresholds:
+            if score >= threshold:
+                return Classification(risk, score, tuple(fired))
+        return Classification("GREEN", score, tuple(fired))
+
+    def classify(self, text: str) -> Classification:
+        return self.classify_batch([text])[0]
+
+    def classify_batch(self, texts: Iterable[str]) -> List[Classification]:
+        """여러 본문을 구분 문자로 이어 오토마톤을 한 번만 돌린다."""
+        texts = list(texts)
+        fired: List[List[str]] = [[] for _ in texts]
+        delta, out, step = self._delta, self._out, self._step
+        state, idx = 0, 0
+        for ch in "\0".join(t.replace("\0", " ") for t in texts).lower():
+            if ch == "\0":
+                state, idx = 0, idx + 1
+                continue
+            nxt = delta[state].get(ch)
+            state = step(state, ch) if nxt is None else nxt
+            if out[state]:
+                hits = fired[idx]
+                for term in out[state]:
+                    if term not in hits:
+                        hits.append(term)
+        return [self._grade(hits) for hits in fired]
+
+
+_classifier: Optional[RiskClassifier] = None
+
+
+def get_classifier() -> RiskClassifier:
+    global _classifier
+    if _classifier is None:
+        _classifier = RiskClassifier.from_file()
+    return _classifier
+
+
+def classify_risk(title: str) -> str:
+    return get_classifier().classify(title).risk
+
+
+def parse_results(html: str, limit: int = MAX_ITEMS_PER_KEYWORD) -> List[dict]:
+    soup = BeautifulSoup(html, "html.parser")
+    items = []
+    for a in soup.select("a.news_tit"):
+        title = (a.get("title") or a.get_text()).strip()
+        link = a.get("href", "").strip()
+        if not title or not link:
+            continue
+        items.append({"title": title, "link": link})
+        if len(items) >= limit:
+            break
+    return items
+
+
+def extract_article(content: bytes) -> dict:
+    """기사 페이지에서 언론사, 보도 시각, 리드 문단을 뽑는다.
+
+    본문 파싱이 CPU 를 많이 쓰므로 enrich() 가 워커 프로세스에서 부른다.
+    """
+    soup = BeautifulSoup(content, "html.parser")
+
+    def meta(*names):
+        for name in names:
+            tag = (soup.find("meta", attrs={"property": name})
+                   or soup.find("meta", attrs={"name": name}))
+            if tag and tag.get("content", "").strip():
+                return tag["content"].strip()
+        return ""
+
+    published = meta("article:published_time", "og:article:published_time", "pubdate", "date")
+    if not published:
+        tag = soup.find("time", attrs={"datetime": True})
+        published = tag["datetime"].strip() if tag else ""
+
+    lead = meta("og:description", "description")
+    if not lead:
+        for p in soup.find_all("p"):
+            text = p.get_text(" ", strip=True)
+            if len(text) >= 40:
+                lead = text
+                break
+
+    return {
+        "publisher": meta("og:site_name", "application-name", "author"),
+        "published": published,
+        "lead": lead[:LEAD_MAX_CHARS],
+    }
+
+
+def enrich(rows: List[dict], fetcher: Fetcher, fetch_workers: int = DEFAULT_WORKERS,
+           processes: int = ENRICH_PROCESSES, path: Optional[str] = ENRICH_FILE) -> int:
+    """신규 행의 기사 본문을 받아 언론사/보도 시각/리드 문단을 뽑는다.
+
+    받기는 스레드(fetcher 의 호스트별 제한 적용), 파싱은 프로세스 풀에서 한다
+    (processes 가 0 이면 현재 프로세스에서 파싱). 위험도는 제목과 리드 문단을
+    함께 보고 다시 매기고, 뽑은 정보는 path 에 링크별 JSON 한 줄로 덧붙인다.
+    rows 를 그대로 고쳐 쓰며 보강한 건수를 돌려준다.
+    """
+    if not rows:
+        return 0
+    records = []
+    # 받기 스레드가 도는 중에 fork 하면 자식이 세션/로그/sqlite 잠금을 잡힌 채로 물려받을
+    # 수 있다. 스레드 없는 forkserver(없으면 spawn)에서 파싱 프로세스를 띄운다
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    cpu = ProcessPoolExecutor(max_workers=processes, mp_context=context) if processes > 0 else None
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, fetch_workers)) as io:
+            fetches = {io.submit(fetcher.get, row["link"]): row for row in rows}
+            parses = {}
+            for fut in as_completed(fetches):
+                row = fetches[fut]
+                resp = fut.result()
+                if resp is None or resp.status_code != 200:
+                    log.warning("본문 수집 실패: %s", row["link"])
+                    continue
+                if cpu:
+                    parses[cpu.submit(extract_article, resp.content)] = row
+                else:
+                    records.append((row, extract_article(resp.content)))
+            for fut in as_completed(parses):
+                try:
+                    records.append((parses[fut], fut.result()))
+                except Exception:
+                    log.exception("본문 파싱 실패: %s", parses[fut]["link"])
+    finally:
+        if cpu:
+            cpu.shutdown()
+
+    scored = [(row, info) for row, info in records if info["lead"]]
+    results = get_classifier().classify_batch(f"{row['title']} {info['lead']}" for row, info in scored)
+    for (row, _), result in zip(scored, results):
+        row["risk"], row["rules"] = result.risk, "|".join(result.rules)
+    if path:
+        with open(path, "a", encoding="utf-8") as f:
+            for row, info in records:
+                f.write(json.dumps(dict(link=row["link"], **info), ensure_ascii=False) + "\n")
+    return len(records)
+
+
+def crawl_keyword(fetcher: Fetcher, keyword: str, date: str,
+                  search_url: str = SEARCH_URL,
+                  cache: Optional[FetchCache] = None,
+                  report: Optional[RunReport] = None) -> List[dict]:
+    url = search_url.format(query=quote_plus(keyword))
+    entry = cache.get(url) if cache else None
+    with _stage(report, "fetch"):
+        resp = fetcher.get(url, headers=FetchCache.conditional_headers(entry))
+    if resp is None or resp.status_code not in (200, 304):
+        log.error("[%s] 수집 실패", keyword)
+        if report:
+            report.count("keywords_failed")
+        return []
+
+    if resp.status_code == 304 and entry:
+        items = entry["items"]
+    else:
+        with _stage(report, "parse"):
+            digest = hashlib.sha1(resp.content).hexdigest()
+            if entry and entry["hash"] == digest:
+                items = entry["items"]
+            else:
+                items = parse_results(resp.text)
+                entry = None
+        if cache:
+            cache.put(url, resp, digest, items)
+    if cache:
+        cache.record(hit=entry is not None)
+
+    with _stage(report, "classify"):
+        results = get_classifier().classify_batch(item["title"] for item in items)
+    return [{
+        "keyword": keyword,
+        "title": item["title"],
+        "link": item["link"],
+        "date": date,
+        "risk": result.risk,
+        "rules": "|".join(result.rules),
+    } for item, result in zip(items, results)]
+
+
+def crawl(keywords: Iterable[str], workers: int = DEFAULT_WORKERS,
+          search_url: str = SEARCH_URL, fetcher: Optional[Fetcher] = None,
+          date: Optional[str] = None, cache: Optional[FetchCache] = None,
+          report: Optional[RunReport] = None) -> List[dict]:
+    """키워드를 병렬로 수집한다. 결과는 입력 키워드 순서를 유지한다."""
+    keywords = list(keywords)
+    date = date or datetime.datetime.now(KST).strftime("%Y-%m-%d")
+    own_fetcher = fetcher is None
+    fetcher = fetcher or Fetcher(workers=workers)
+    results: Dict[str, List[dict]] = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {pool.submit(crawl_keyword, fetcher, kw, date, search_url, cache, report): kw
+                       for kw in keywords}
+            for fut in as_completed(futures):
+                kw = futures[fut]
+                try:
+                    results[kw] = fut.result()
+                except Exception:
+                    log.exception("[%s] 처리 중 오류", kw)
+                    results[kw] = []
+                    if report:
+                        report.count("keywords_failed")
+                log.info("[%s] %d건", kw, len(results[kw]))
+    finally:
+        if own_fetcher:
+            fetcher.close()
+    if report:
+        report.items.update((kw, len(results.get(kw, []))) for kw in keywords)
+    return [row for kw in keywords for row in results.get(kw, [])]
+
+
+def normalize_url(link: str) -> str:
+    """같은 기사를 가리키는 링크가 같은 값이 되도록 정규화한다.
+
+    &amp; 디코딩, 스킴/www./m. 제거, 경로의 // 축약, 추적용 파라미터(?f=p,
+    utm_* 등)와 빈 파라미터 제거 후 나머지 파라미터를 정렬한다.
+    """
+    parts = urlsplit(html.unescape(link.strip()))
+    host = parts.netloc.lower()
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/")
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+    )
+    return host + path + ("?" + urlencode(query) if query else "")
+
+
+def normalize_title(title: str) -> str:
+    """공백·문장부호·대소문자 차이를 무시한 제목 비교 키."""
+    title = unicodedata.normalize("NFKC", html.unescape(title)).lower()
+    return re.sub(r"[\W_]+", "", title)
+
+
+def dedup_keys(row: dict) -> List[str]:
+    keys = ["u:" + normalize_url(row["link"])]
+    title = normalize_title(row["title"])
+    if title:
+        keys.append("t:" + title)
+    return keys
+
+
+def minhash(title: str) -> Tuple[int, ...]:
+    """정규화한 제목의 글자 2-gram 집합에 대한 MinHash 서명."""
+    text = normalize_title(title)
+    shingles = {text[i:i + 2] for i in range(len(text) - 1)} or {text}
+    hashes = [zlib.crc32(sh.encode("utf-8")) for sh in shingles]
+    return tuple(min((a * h + b) % _MERSENNE for h in hashes) for a, b in _MINHASH_PARAMS)
+
+
+def lsh_bands(sig: Tuple[int, ...]) -> List[str]:
+    width = len(sig) // LSH_BANDS
+    return [
+        "%d:%s" % (b, hashlib.sha1(struct.pack("<%dQ" % width, *sig[b * width:(b + 1) * width]))
+                   .hexdigest()[:16])
+        for b in range(LSH_BANDS)
+    ]
+
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def new_cluster_id(row: dict) -> str:
+    return hashlib.sha1(normalize_url(row["link"]).encode("utf-8")).hexdigest()[:12]
+
+
+class StoryClusters:
+    """메모리 안의 LSH 버킷. 날짜순으로 넣으면서 window_days 보다 오래된 기사는 뺀다."""
+
+    def __init__(self, window_days: int = CLUSTER_WINDOW_DAYS):
+        self.window = datetime.timedelta(days=window_days)
+        self.buckets: Dict[str, List[Tuple[Tuple[int, ...], str]]] = {}
+        self.order: deque = deque()
+
+    def candidates(self, bands: List[str]) -> List[Tuple[Tuple[int, ...], str]]:
+        return [c for band in bands for c in self.buckets.get(band, ())]
+
+    def add(self, date: str, bands: List[str], sig: Tuple[int, ...], cluster: str):
+        entry = (sig, cluster)
+        for band in bands:
+            self.buckets.setdefault(band, []).append(entry)
+        self.order.append((date, bands, entry))
+
+    def evict_before(self, date: str):
+        try:
+            cutoff = (datetime.date.fromisoformat(date) - self.window).isoformat()
+        except ValueError:
+            return
+        while self.order and self.order[0][0] < cutoff:
+            _, bands, entry = self.order.popleft()
+            for band in bands:
+                bucket = self.buckets.get(band)
+                if bucket:
+                    bucket.remove(entry)
+                    if not bucket:
+                        del self.buckets[band]
+
+
+def assign_cluster(row: dict, candidates: Iterable[Tuple[Tuple[int, ...], str]]) -> Tuple[int, ...]:
+    """후보 중 가장 비슷한 묶음에 row 를 넣는다 (없으면 새 묶음). 서명을 돌려준다.
+
+    이미 cluster_id 가 있는 행은 그대로 둔다.
+    """
+    sig = minhash(row["title"])
+    if not row.get("cluster_id"):
+        best, best_sim = None, CLUSTER_THRESHOLD
+        for cand_sig, cluster in candidates:
+            sim = similarity(sig, cand_sig)
+            if sim >= best_sim:
+                best, best_sim = cluster, sim
+        row["cluster_id"] = best or new_cluster_id(row)
+    return sig
+
+
+class DedupIndex:
+    """data.csv 에 이미 들어간 기사의 정규화 URL/제목 색인 (sqlite).
+
+    색인에 마지막으로 반영한 data.csv 크기와 수정 시각을 함께 기록해 두고, 파일이
+    없거나 둘 중 하나라도 다르면(수동 편집 등) data.csv 를 읽어 다시 만든다. 평소에는 신규
+    기사만 조회·추가하므로 비용이 누적 이력이 아니라 신규 건수에 비례한다.
+
+    최근 CLUSTER_WINDOW_DAYS 일 기사의 MinHash 서명과 LSH 밴드도 함께 두어
+    신규 기사를 기존 유사 기사 묶음에 붙인다.
+
+    compact 가 보존 기간 밖으로 빼 data.csv 에 없는 기사의 키는 expired 에 따로
+    두고, 다시 만들 때도 seen 에 넣어 같은 기사를 또 받지 않는다. sync 가
+    거짓이면 data.csv 와 맞춰 보지 않고 연다.
+    """
+
+    def __init__(self, path: str = INDEX_FILE, data_path: str = DATA_FILE, sync: bool = True):
+        self.path = path
+        self.data_path = data_path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY) WITHOUT ROWID")
+        self.db.execute("CREATE TABLE IF NOT EXISTS expired (key TEXT PRIMARY KEY) WITHOUT ROWID")
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS docs "
+                        "(key TEXT PRIMARY KEY, cluster TEXT, date TEXT, sig BLOB) WITHOUT ROWID")
+        self.db.execute("CREATE TABLE IF NOT EXISTS lsh "
+                        "(band TEXT, key TEXT, PRIMARY KEY (band, key)) WITHOUT ROWID")
+        if sync and self._synced_stamp() != _file_stamp(data_path):
+            self.rebuild(read_csv(data_path))
+
+    def _synced_stamp(self) -> Optional[str]:
+        row = self.db.execute("SELECT value FROM meta WHERE name = 'csv_stamp'").fetchone()
+        return row[0] if row else None
+
+    def mark_synced(self):
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('csv_stamp', ?)",
+                            (_file_stamp(self.data_path),))
+
+    def rebuild(self, rows: Iterable[dict]):
+        log.info("중복 제거 색인 재구성: %s", self.data_path)
+        cutoff = self._window_start()
+        recent = []
+
+        def keys():
+            for row in rows:
+                if row.get("date", "") >= cutoff:
+                    recent.append(row)
+                for k in dedup_keys(row):
+                    yield (k,)
+
+        with self.db:
+            for table in ("seen", "docs", "lsh"):
+                self.db.execute(f"DELETE FROM {table}")
+            self.db.executemany("INSERT OR IGNORE INTO seen VALUES (?)", keys())
+            self.db.execute("INSERT OR IGNORE INTO seen SELECT key FROM expired")
+        recent.sort(key=lambda r: r.get("date", ""))
+        self.assign_clusters(recent)
+        self._index_clusters(recent)
+        self.mark_synced()
+
+    @staticmethod
+    def _window_start() -> str:
+        today = datetime.datetime.now(KST).date()
+        return (today - datetime.timedelta(days=CLUSTER_WINDOW_DAYS)).isoformat()
+
+    def assign_clusters(self, rows: List[dict]):
+        """rows 에 cluster_id 를 매긴다. 색인의 최근 기사와 rows 안의 앞선 기사가 후보다.
+
+        색인에는 add() 할 때 기록한다.
+        """
+        batch = StoryClusters()
+        for row in rows:
+            bands = lsh_bands(minhash(row["title"]))
+            row["_sig"] = assign_cluster(row, self._candidates(bands) + batch.candidates(bands))
+            row["_bands"] = bands
+            batch.add(row.get("date", ""), bands, row["_sig"], row["cluster_id"])
+
+    def _candidates(self, bands: List[str]) -> List[Tuple[Tuple[int, ...], str]]:
+        marks = ",".join("?" * len(bands))
+        found = self.db.execute(
+            f"SELECT DISTINCT d.key, d.sig, d.cluster FROM lsh l JOIN docs d ON d.key = l.key "
+            f"WHERE l.band IN ({marks})", bands).fetchall()
+        return [(struct.unpack("<%dQ" % MINHASH_SIZE, sig), cluster) for _, sig, cluster in found]
+
+    def _index_clusters(self, rows: Iterable[dict]):
+        cutoff = self._window_start()
+        with self.db:
+            for row in rows:
+                if "_sig" not in row or row.get("date", "") < cutoff:
+                    continue
+                key = normalize_url(row["link"])
+                self.db.execute("INSERT OR REPLACE INTO docs VALUES (?, ?, ?, ?)",
+                                (key, row["cluster_id"], row.get("date", ""),
+                                 struct.pack("<%dQ" % MINHASH_SIZE, *row["_sig"])))
+                self.db.executemany("INSERT OR IGNORE INTO lsh VALUES (?, ?)",
+                                    ((band, key) for band in row["_bands"]))
+            self.db.execute("DELETE FROM lsh WHERE key IN (SELECT key FROM docs WHERE date < ?)",
+                            (cutoff,))
+            self.db.execute("DELETE FROM docs WHERE date < ?", (cutoff,))
+
+    def filter_new(self, rows: Iterable[dict]) -> List[dict]:
+        """색인에 없는 기사만 돌려준다.
+
+        같은 배치 안의 중복(여러 키워드에 걸린 같은 기사)은 먼저 나온 것만 남긴다.
+        """
+        fresh, batch = [], set()
+        for row in rows:
+            keys = dedup_keys(row)
+            if any(k in batch for k in keys) or self._seen(keys):
+                continue
+            batch.update(keys)
+            fresh.append(row)
+        return fresh
+
+    def add(self, rows: List[dict]):
+        """data.csv 에 덧붙인 행을 색인에 반영한다."""
+        with self.db:
+            self.db.executemany("INSERT OR IGNORE INTO seen VALUES (?)",
+                                ((k,) for row in rows for k in dedup_keys(row)))
+        self._index_clusters(rows)
+        self.mark_synced()
+
+    def expire(self, keys: Iterable[str]):
+        """data.csv 에서 빠져도 이미 받은 기사로 볼 키를 남긴다 (compact 의 보존 기간)."""
+        with self.db:
+            for table in ("expired", "seen"):
+                self.db.executemany(f"INSERT OR IGNORE INTO {table} VALUES (?)",
+                                    ((k,) for k in keys))
+
+    def _seen(self, keys: List[str]) -> bool:
+        marks = ",".join("?" * len(keys))
+        return self.db.execute(f"SELECT 1 FROM seen WHERE key IN ({marks}) LIMIT 1",
+                               keys).fetchone() is not None
+
+    def close(self):
+        self.db.close()
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _file_stamp(path: str) -> str:
+    """파일이 바뀌었는지 볼 값 ("크기:수정 시각 ns"). 크기가 같은 편집도 잡는다."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ""
+    return "%d:%d" % (st.st_size, st.st_mtime_ns)
+
+
+def read_csv(path: str = DATA_FILE) -> Iterable[dict]:
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            if row.get("title") and row.get("link"):
+                yield row
+
+
+def save_csv(rows: Iterable[dict], path: str = DATA_FILE):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp, path)
+
+
+def _csv_header(path: str) -> List[str]:
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def append_csv(rows: List[dict], path: str = DATA_FILE):
+    """신규 행만 data.csv 끝에 덧붙인다.
+
+    파일이 없으면 헤더부터 쓰고, 헤더가 FIELDS 와 다르면(컬럼이 추가된 뒤
+    처음 쓰는 경우) 기존 행까지 새 헤더로 한 번 다시 쓴다.
+    """
+    if not _file_size(path):
+        save_csv(rows, path)
+        return
+    if _csv_header(path) != FIELDS:
+        save_csv(list(read_csv(path)) + list(rows), path)
+        return
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction="ignore")
+        writer.writerows(rows)
+
+
+def _empty_partition(date: str) -> dict:
+    # keywords: 키워드별 [RED, AMBER, GREEN] 건수 (날짜 x 키워드 x 위험도 집계)
+    return {"date": date, "file": f"{date}.csv", "index": f"{date}.idx.json",
+            "bundle": f"{date}.bin", "rows": 0,
+            "risk": {level: 0 for level in RISK_LEVELS}, "keywords": {}}
+
+
+def _count(part: dict, row: dict):
+    part["rows"] += 1
+    risk = row.get("risk") if row.get("risk") in RISK_LEVELS else "GREEN"
+    part["risk"][risk] += 1
+    cell = part["keywords"].setdefault(row["keyword"], [0] * len(RISK_LEVELS))
+    cell[RISK_LEVELS.index(risk)] += 1
+
+
+def group_members(keywords: Iterable[str]) -> Dict[str, List[str]]:
+    """KEYWORD_GROUPS 이름별로 속하는 수집 키워드 목록 (대시보드와 같은 부분 일치 규칙)."""
+    keywords = sorted(set(keywords))
+    return {
+        name: [kw for kw in keywords if any(k in kw or kw in k for k in group)]
+        for name, group in KEYWORD_GROUPS.items()
+    }
+
+
+def keyword_filters(keywords: Iterable[str]) -> Dict[str, List[str]]:
+    """대시보드 키워드 버튼 값("GROUP:그룹" 또는 그룹 안의 키워드)별로 걸리는 수집 키워드 목록.
+
+    대시보드가 행마다 하던 양방향 부분 일치를 여기서 한 번만 푼다. 걸리는 키워드가
+    없는 버튼은 빠진다.
+    """
+    keywords = sorted(set(keywords))
+    filters = {}
+    for name, group in KEYWORD_GROUPS.items():
+        for value, patterns in [(f"GROUP:{name}", group)] + [(k, [k]) for k in group]:
+            members = [kw for kw in keywords if any(k in kw or kw in k for k in patterns)]
+            if members:
+                filters[value] = members
+    return filters
+
+
+def text_grams(text: str) -> set:
+    """검색 색인용 글자 1-gram/2-gram. 한글은 띄어쓰기 없이도 두 글자면 걸린다."""
+    text = text.lower()
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return {g for g in grams if not g.isspace()}
+
+
+def build_search_index(rows: Iterable[dict]) -> dict:
+    """제목/키워드 역색인. grams 의 값은 파티션 CSV 안의 행 번호 목록이다.
+
+    대시보드는 검색어의 gram 들이 모두 들어 있는 행만 후보로 삼고, 후보에 대해서만
+    원래처럼 부분 문자열 비교를 한다.
+    """
+    postings: Dict[str, List[int]] = {}
+    n = 0
+    for n, row in enumerate(rows, 1):
+        grams = text_grams(row.get("title", "")) | text_grams(row.get("keyword", ""))
+        for g in grams:
+            postings.setdefault(g, []).append(n - 1)
+    return {"rows": n, "grams": postings}
+
+
+def _write_search_index(rows: Iterable[dict], root: str, part: dict):
+    tmp = os.path.join(root, part["index"] + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(build_search_index(rows), f, ensure_ascii=False, separators=(",", ":"),
+                  sort_keys=True)
+    os.replace(tmp, os.path.join(root, part["index"]))
+
+
+def _day_number(date: str) -> int:
+    try:
+        return (datetime.date.fromisoformat(date) - EPOCH).days
+    except ValueError:
+        return BUNDLE_INVALID_DAY
+
+
+def build_bundle(rows: Iterable[dict]) -> bytes:
+    """행을 열 단위로 묶어 gzip 한 바이트열. 대시보드가 CSV 파싱 없이 typed array 로 읽는다.
+
+    행 순서는 그대로 둔다 (파티션 CSV·검색 색인의 행 번호와 같아야 한다). 압축을 풀면
+    리틀 엔디언으로 다음이 이어진다.
+
+        b"NWB1", uint32 헤더 길이, 헤더 JSON, 4바이트 경계까지 0
+        day       int32[n]   1970-01-01 부터의 일수 (날짜가 잘못되면 -2**31)
+        offsets   uint32[n+1] x 텍스트 열 수   열 문자열 안의 UTF-16 위치
+        keyword   uint16[n]  헤더 keywords 사전 번호
+        risk      uint8[n]   헤더 risks 사전 번호
+        text      UTF-8 x 텍스트 열 수   행 값을 이어 붙인 열 문자열
+
+    헤더: {"rows": n, "keywords": [...], "risks": [...], "text": [[열 이름, 바이트 수], ...]}
+    """
+    rows = list(rows)
+    keywords = sorted({row.get("keyword", "") for row in rows})
+    risks = RISK_LEVELS + sorted({row.get("risk", "") for row in rows} - set(RISK_LEVELS))
+    kw_ids = {k: i for i, k in enumerate(keywords)}
+    risk_ids = {r: i for i, r in enumerate(risks)}
+
+    columns = [
+        array("i", (_day_number(row.get("date", "")) for row in rows)),
+    ]
+    texts = []
+    for field in BUNDLE_TEXT_FIELDS:
+        values = [row.get(field) or "" for row in rows]
+        offsets, pos = array("I", [0]), 0
+        for value in values:
+            pos += len(value.encode("utf-16-le")) // 2
+            offsets.append(pos)
+        columns.append(offsets)
+        texts.append("".join(values).encode("utf-8"))
+    columns.append(array("H", (kw_ids[row.get("keyword", "")] for row in rows)))
+    columns.append(array("B", (risk_ids[row.get("risk", "")] for row in rows)))
+    if sys.byteorder == "big":
+        for column in columns:
+            column.byteswap()
+
+    header = json.dumps({
+        "rows": len(rows), "keywords": keywords, "risks": risks,
+        "text": [[f, len(t)] for f, t in zip(BUNDLE_TEXT_FIELDS, texts)],
+    }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    head = BUNDLE_MAGIC + struct.pack("<I", len(header)) + header
+    head += b"\0" * (-len(head) % 4)
+    body = b"".join([head] + [c.tobytes() for c in columns] + texts)
+    # mtime=0: 내용이 같으면 파일도 같게 (커밋 diff 를 줄인다)
+    return gzip.compress(body, mtime=0)
+
+
+def _write_bundle(rows: Iterable[dict], root: str, part: dict):
+    tmp = os.path.join(root, part["bundle"] + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(build_bundle(rows))
+    os.replace(tmp, os.path.join(root, part["bundle"]))
+
+
+def load_manifest(root: str = PARTITION_DIR) -> Optional[dict]:
+    try:
+        with open(os.path.join(root, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def read_rollups(path: str) -> Iterable[dict]:
+    """일별 집계 파일을 최신 날짜부터 하루씩 읽는다. 날마다 파티션과 같은 rows/risk/keywords."""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _empty_rollup(date: str) -> dict:
+    return {"date": date, "rows": 0, "risk": {level: 0 for level in RISK_LEVELS}, "keywords": {}}
+
+
+def _add_rollup(day: dict, other: dict):
+    day["rows"] += other["rows"]
+    for level, n in other["risk"].items():
+        day["risk"][level] = day["risk"].get(level, 0) + n
+    for kw, cell in other["keywords"].items():
+        mine = day["keywords"].setdefault(kw, [0] * len(RISK_LEVELS))
+        for k, n in enumerate(cell):
+            mine[k] += n
+
+
+def _rollup_line(day: dict) -> str:
+    return json.dumps(day, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def write_rollups(days: Iterable[dict], root: str = PARTITION_DIR):
+    """최신 날짜부터 오는 일별 집계를 기존 rollups.jsonl 과 합쳐 다시 쓴다 (같은 날은 더한다).
+
+    두 쪽 모두 날짜순이므로 한 번에 하루치씩만 메모리에 둔다.
+    """
+    path = os.path.join(root, ROLLUP_NAME)
+    merged = heapq.merge(read_rollups(path), days, key=lambda d: d["date"], reverse=True)
+    os.makedirs(root, exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        for date, group in itertools.groupby(merged, key=lambda d: d["date"]):
+            day = _empty_rollup(date)
+            for other in group:
+                _add_rollup(day, other)
+            f.write(_rollup_line(day))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+
+def save_manifest(manifest: dict, root: str = PARTITION_DIR, data_path: str = DATA_FILE):
+    manifest["partitions"].sort(key=lambda p: p["date"], reverse=True)
+    manifest["total"] = sum(p["rows"] for p in manifest["partitions"])
+    # 집계만 남은 날은 파일 이름과 가장 최근 날짜만 적는다 (대시보드가 필요할 때 받는다)
+    keywords = set(manifest["keywords"])
+    rollups = {"file": ROLLUP_NAME, "days": 0, "newest": None}
+    for day in read_rollups(os.path.join(root, ROLLUP_NAME)):
+        rollups["days"] += 1
+        rollups["newest"] = rollups["newest"] or day["date"]
+        keywords.update(day["keywords"])
+    manifest["rollups"] = rollups if rollups["days"] else None
+    manifest["keywords"] = sorted(keywords)
+    manifest["groups"] = group_members(manifest["keywords"])
+    manifest["filters"] = keyword_filters(manifest["keywords"])
+    manifest["version"] = MANIFEST_VERSION
+    manifest["updated"] = datetime.datetime.now(KST).isoformat(timespec="seconds")
+    manifest["source_stamp"] = _file_stamp(data_path)
+    tmp = os.path.join(root, MANIFEST_NAME + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, os.path.join(root, MANIFEST_NAME))
+
+
+def rebuild_partitions(rows: Iterable[dict], root: str = PARTITION_DIR,
+                       data_path: str = DATA_FILE, presorted: bool = False) -> dict:
+    """전체 행으로 일자별 파티션과 manifest.json 을 새로 만든다.
+
+    presorted: rows 가 날짜순으로 정렬돼 있으면 하루치씩만 메모리에 올린다.
+    """
+    os.makedirs(root, exist_ok=True)
+    for name in os.listdir(root):
+        if PARTITION_FILE_RE.match(name):
+            os.remove(os.path.join(root, name))
+    dated = (row for row in rows if DATE_RE.match(row.get("date") or ""))
+    if presorted:
+        days: Iterable[Tuple[str, Iterable[dict]]] = itertools.groupby(dated, key=lambda r: r["date"])
+    else:
+        by_date: Dict[str, List[dict]] = {}
+        for row in dated:
+            by_date.setdefault(row["date"], []).append(row)
+        days = by_date.items()
+    manifest = {"partitions": [], "keywords": []}
+    keywords = set()
+    for date, day_rows in days:
+        day_rows = list(day_rows)
+        part = _empty_partition(date)
+        for row in day_rows:
+            _count(part, row)
+            keywords.add(row["keyword"])
+        save_csv(day_rows, os.path.join(root, part["file"]))
+        _write_search_index(day_rows, root, part)
+        _write_bundle(day_rows, root, part)
+        manifest["partitions"].append(part)
+    manifest["keywords"] = list(keywords)
+    save_manifest(manifest, root, data_path)
+    return manifest
+
+
+def partitions_stale(root: str = PARTITION_DIR, data_path: str = DATA_FILE) -> bool:
+    """manifest 가 없거나 형식이 예전 것이거나, 마지막으로 반영한 data.csv 의 크기·수정
+    시각이 지금과 다르면 True."""
+    manifest = load_manifest(root)
+    return (manifest is None or manifest.get("version") != MANIFEST_VERSION
+            or manifest.get("source_stamp") != _file_stamp(data_path))
+
+
+def update_partitions(rows: List[dict], root: str = PARTITION_DIR,
+                      data_path: str = DATA_FILE) -> dict:
+    """data.csv 에 덧붙인 신규 행을 날짜 파티션에 덧붙이고 manifest 집계를 갱신한다."""
+    manifest = load_manifest(root)
+    parts = {p["date"]: p for p in manifest["partitions"]}
+    by_date: Dict[str, List[dict]] = {}
+    for row in rows:
+        if DATE_RE.match(row.get("date", "")):
+            by_date.setdefault(row["date"], []).append(row)
+    for date, day_rows in by_date.items():
+        part = parts.get(date)
+        if part is None:
+            part = parts[date] = _empty_partition(date)
+            manifest["partitions"].append(part)
+        for row in day_rows:
+            _count(part, row)
+            manifest["keywords"].append(row["keyword"])
+        path = os.path.join(root, part["file"])
+        append_csv(day_rows, path)
+        # 하루치 파티션은 작으므로 색인과 묶음은 통째로 다시 만든다
+        day_rows = list(read_csv(path))
+        _write_search_index(day_rows, root, part)
+        _write_bundle(day_rows, root, part)
+    save_manifest(manifest, root, data_path)
+    return manifest
+
+
+def reclassify(path: str = DATA_FILE, batch: int = 10000) -> int:
+    """risk_rules.json 이 바뀐 뒤 data.csv 전체의 위험도와 규칙 컬럼을 다시 매긴다.
+
+    batch 건씩 읽고 쓰므로 이력 크기와 관계없이 메모리는 일정하다. 바뀐 행 수를 돌려준다.
+    """
+    classifier = get_classifier()
+    total = changed = 0
+
+    def reclassified():
+        nonlocal total, changed
+        rows = read_csv(path)
+        while True:
+            chunk = list(itertools.islice(rows, batch))
+            if not chunk:
+                return
+            for row, result in zip(chunk, classifier.classify_batch(r["title"] for r in chunk)):
+                rules = "|".join(result.rules)
+                if row.get("risk") != result.risk or row.get("rules") != rules:
+                    changed += 1
+                row["risk"], row["rules"] = result.risk, rules
+            total += len(chunk)
+            yield from chunk
+
+    save_csv(reclassified(), path)
+    log.info("위험도 재분류: %d건 중 %d건 변경", total, changed)
+    return changed
+
+
+def _row_date(row: dict) -> str:
+    return row.get("date") or ""
+
+
+def _spill_sorted_runs(rows: Iterable[dict], folder: str, chunk_rows: int) -> List[str]:
+    """rows 를 chunk_rows 건씩 날짜 내림차순으로 정렬해 run 파일로 쓴다."""
+    runs = []
+    while True:
+        chunk = list(itertools.islice(rows, chunk_rows))
+        if not chunk:
+            return runs
+        chunk.sort(key=_row_date, reverse=True)  # 안정 정렬: 같은 날짜는 원래 순서
+        runs.append(os.path.join(folder, "run-0-%05d.csv" % len(runs)))
+        save_csv(chunk, runs[-1])
+
+
+def merge_sorted_runs(runs: List[str], folder: str,
+                      fan_in: int = COMPACT_FAN_IN) -> Iterable[dict]:
+    """날짜 내림차순 run 파일들을 k-way merge 한 행 스트림.
+
+    파일마다 한 행씩만 올려 두므로 메모리는 파일 수에 비례한다. fan_in 개보다 많으면
+    이웃한 fan_in 개씩 먼저 합쳐 줄인다. 날짜가 같으면 앞 파일의 행이 먼저 나와
+    정렬 전 순서가 유지된다.
+    """
+    level = 0
+    while len(runs) > fan_in:
+        level += 1
+        merged = []
+        for i in range(0, len(runs), fan_in):
+            group = runs[i:i + fan_in]
+            merged.append(os.path.join(folder, "run-%d-%05d.csv" % (level, len(merged))))
+            save_csv(heapq.merge(*map(read_csv, group), key=_row_date, reverse=True), merged[-1])
+            for run in group:
+                os.remove(run)
+        runs = merged
+    return heapq.merge(*map(read_csv, runs), key=_row_date, reverse=True)
+
+
+class _SeenKeys:
+    """compact 용 디스크 위 중복 키 집합 (이력이 커져도 메모리에 다 올리지 않는다)."""
+
+    def __init__(self, path: str):
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode = OFF")
+        self.db.execute("PRAGMA synchronous = OFF")
+        self.db.execute("CREATE TABLE seen (key TEXT PRIMARY KEY) WITHOUT ROWID")
+
+    def add(self, keys: List[str]) -> bool:
+        """keys 중 하나라도 이미 있으면 False, 없으면 넣고 True."""
+        marks = ",".join("?" * len(keys))
+        if self.db.execute(f"SELECT 1 FROM seen WHERE key IN ({marks}) LIMIT 1", keys).fetchone():
+            return False
+        self.db.executemany("INSERT OR IGNORE INTO seen VALUES (?)", ((k,) for k in keys))
+        return True
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+
+def compact(path: str = DATA_FILE, index_path: str = INDEX_FILE, root: str = PARTITION_DIR,
+            retention_days: Optional[int] = None, chunk_rows: int = COMPACT_CHUNK_ROWS) -> int:
+    """data.csv 를 최신순으로 정렬하고 중복을 걷어낸 뒤 파티션과 색인을 다시 만든다.
+
+    링크의 &amp; 같은 HTML 엔티티도 이때 풀고, cluster_id 가 빈 행에는 유사
+    기사 묶음을 매긴다. retention_days 를 주면 그보다 오래된 행은 data.csv 에서
+    빼고 rollups.jsonl 의 일별 (키워드 x 위험도) 집계로만 남긴다. 남은 행 수를 돌려준다.
+
+    chunk_rows 건씩 정렬한 run 파일을 k-way merge 하고 중복 키는 sqlite 에 두어,
+    최대 메모리가 이력 크기가 아니라 chunk_rows 와 하루치 파티션 크기에 비례한다.
+    작업 파일은 data.csv 옆 임시 폴더에 쓴다.
+    """
+    today = datetime.datetime.now(KST).date()
+    cutoff = ((today - datetime.timedelta(days=retention_days)).isoformat()
+              if retention_days is not None else None)
+    total = remaining = rolled = 0
+    kept_files: List[str] = []
+    unclustered = set()  # cluster_id 가 빈 행의 날짜
+    folder = os.path.dirname(os.path.abspath(path))
+    with tempfile.TemporaryDirectory(prefix=".compact-", dir=folder) as tmp:
+        def counted(rows):
+            nonlocal total
+            for row in rows:
+                total += 1
+                yield row
+
+        runs = _spill_sorted_runs(counted(read_csv(path)), tmp, chunk_rows)
+        seen = _SeenKeys(os.path.join(tmp, "seen.db"))
+        kept: List[dict] = []
+        rolled_path = os.path.join(tmp, "rolled.jsonl")
+        rolled_keys = os.path.join(tmp, "rolled-keys.txt")
+        day = None  # 보존 기간 밖으로 빼는 날의 집계 (행이 날짜 내림차순으로 오므로 하루씩)
+
+        def flush():
+            if kept:
+                kept_files.append(os.path.join(tmp, "kept-%05d.csv" % len(kept_files)))
+                save_csv(kept, kept_files[-1])
+                kept.clear()
+                seen.db.commit()
+
+        try:
+            with open(rolled_path, "w", encoding="utf-8") as rolled_out, \
+                    open(rolled_keys, "w", encoding="utf-8") as keys_out:
+                for row in merge_sorted_runs(runs, tmp):
+                    keys = dedup_keys(row)
+                    if not seen.add(keys):
+                        continue
+                    date = _row_date(row)
+                    if cutoff and DATE_RE.match(date) and date < cutoff:
+                        if day is None or day["date"] != date:
+                            if day:
+                                rolled_out.write(_rollup_line(day))
+                            day = _empty_rollup(date)
+                        _count(day, row)
+                        keys_out.writelines(k + "\n" for k in keys)
+                        rolled += 1
+                        continue
+                    row["link"] = html.unescape(row["link"].strip())
+                    if not row.get("cluster_id"):
+                        unclustered.add(date)
+                    kept.append(row)
+                    remaining += 1
+                    if len(kept) >= chunk_rows:
+                        flush()
+                if day:
+                    rolled_out.write(_rollup_line(day))
+            flush()
+        finally:
+            seen.close()
+
+        # 묶음이 없는 행은 오래된 것부터 유사 기사 묶음에 넣는다. 후보가 될 수 있는
+        # (묶음 없는 행보다 CLUSTER_WINDOW_DAYS 일 안쪽 앞선) 날의 행만 서명을 만든다
+        window = _cluster_window_dates(unclustered)
+        clusters = StoryClusters()
+        for kept_file in reversed(kept_files):
+            chunk = list(read_csv(kept_file))
+            touched = False
+            for row in reversed(chunk):
+                date = _row_date(row)
+                if date not in window:
+                    continue
+                clusters.evict_before(date)
+                bands = lsh_bands(minhash(row["title"]))
+                sig = assign_cluster(row, clusters.candidates(bands))
+                clusters.add(date, bands, sig, row["cluster_id"])
+                touched = True
+            if touched:
+                save_csv(chunk, kept_file)
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for kept_file in kept_files:
+                writer.writerows(read_csv(kept_file))
+            f.flush()
+            os.fsync(f.fileno())
+        # 빼낸 행의 집계와 키를 먼저 남기고 data.csv 를 바꾼다. 중간에 멈추면 옛 data.csv 가
+        # 그대로 있고, 바꾼 뒤에 멈춰도 집계와 색인의 키는 이미 디스크에 있다
+        try:
+            if rolled:
+                write_rollups(read_rollups(rolled_path), root)
+                index = DedupIndex(index_path, path, sync=False)
+                try:
+                    with open(rolled_keys, encoding="utf-8") as f:
+                        index.expire(line.rstrip("\n") for line in f)
+                finally:
+                    index.close()
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        os.replace(tmp_path, path)
+    rebuild_partitions(read_csv(path), root, path, presorted=True)
+    index = DedupIndex(index_path, path, sync=False)
+    try:
+        index.rebuild(read_csv(path))
+    finally:
+        index.close()
+    log.info("압축 완료: %d건 -> %d건 (보존 기간 밖 %d건은 일별 집계로)", total, remaining, rolled)
+    return remaining
+
+
+def _cluster_window_dates(dates: Iterable[str]) -> set:
+    """dates 의 각 날짜와 그 앞 CLUSTER_WINDOW_DAYS 일. 날짜 형식이 아니면 그대로 넣는다."""
+    window = set()
+    for date in dates:
+        try:
+            day = datetime.date.fromisoformat(date)
+        except ValueError:
+            window.add(date)
+            continue
+        window.update((day - datetime.timedelta(days=i)).isoformat()
+                      for i in range(CLUSTER_WINDOW_DAYS + 1))
+    return window
+
+
+def load_keywords(path: Optional[str]) -> List[str]:
+    if not path:
+        return list(KEYWORDS)
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Security Insight Pro 뉴스 크롤러")
+    p.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS,
+                   help="동시 수집 스레드 수 (기본 %(default)s). 검색은 한 호스트로 가므로 "
+                        "동시 요청은 --per-host, 초당 요청은 --rate 를 넘지 않는다")
+    p.add_argument("-k", "--keywords-file", help="한 줄에 하나씩 키워드가 적힌 파일")
+    p.add_argument("--per-host", type=int, default=PER_HOST_LIMIT,
+                   help="호스트별 동시 요청 수 (기본 %(default)s)")
+    p.add_argument("--rate", type=float, default=RATE_LIMIT,
+                   help="전체 초당 요청 수, 0 이면 무제한 (기본 %(default)s)")
+    p.add_argument("--retries", type=int, default=MAX_RETRIES,
+                   help="요청 실패 시 재시도 횟수 (기본 %(default)s)")
+    p.add_argument("--search-url", default=SEARCH_URL,
+                   help="검색 URL 템플릿, {query} 자리에 키워드가 들어간다")
+    p.add_argument("--enrich", action="store_true",
+                   help="신규 기사 본문을 받아 언론사/보도 시각/리드 문단을 %s 에 기록" % ENRICH_FILE)
+    p.add_argument("--enrich-processes", type=int, default=ENRICH_PROCESSES,
+                   help="본문 파싱 프로세스 수, 0 이면 파싱을 현재 프로세스에서 (기본 %(default)s)")
+    p.add_argument("--enrich-per-host", type=int, default=ENRICH_PER_HOST,
+                   help="본문 수집 시 언론사별 동시 요청 수 (기본 %(default)s)")
+    p.add_argument("--host-delay", type=float, default=ENRICH_HOST_DELAY,
+                   help="본문 수집 시 같은 언론사 요청 간 최소 간격(초) (기본 %(default)s)")
+    p.add_argument("--no-cache", action="store_true",
+                   help="수집 캐시를 쓰지 않고 모든 페이지를 새로 받는다")
+    p.add_argument("--cache-file", default=CACHE_FILE)
+    p.add_argument("--cache-size", type=int, default=CACHE_MAX_ENTRIES,
+                   help="캐시에 보관할 최대 URL 수 (기본 %(default)s)")
+    p.add_argument("--index-file", default=INDEX_FILE,
+                   help="중복 제거 색인 파일 (없으면 data.csv 에서 다시 만든다)")
+    p.add_argument("--partition-dir", default=PARTITION_DIR,
+                   help="일자별 파티션과 manifest.json 을 쓸 폴더 (기본 %(default)s)")
+    p.add_argument("--compact", action="store_true",
+                   help="수집 없이 data.csv 를 정렬·중복 제거하고 색인·파티션을 다시 만든다")
+    p.add_argument("--retention-days", type=int, metavar="DAYS",
+                   help="--compact 때 DAYS 일보다 오래된 기사는 data.csv 에서 빼고 %s 의 "
+                   "일별 키워드/위험도 집계로만 남긴다" % ROLLUP_NAME)
+    p.add_argument("--reclassify", action="store_true",
+                   help="수집 없이 %s 기준으로 data.csv 위험도를 다시 매기고 파티션을 다시 만든다"
+                   % os.path.basename(RISK_RULES_FILE))
+    p.add_argument("--report",
+                   help="실행 보고서(JSON) 경로 (기본: 파티션 폴더의 %s)" % REPORT_NAME)
+    p.add_argument("--metrics-file",
+                   help="실행 지표를 Prometheus textfile 형식으로도 쓸 경로 (.prom)")
+    p.add_argument("--profile", metavar="PATH",
+                   help="cProfile 결과를 PATH 에 저장 (python -m pstats PATH 로 확인)")
+    p.add_argument("--site-dir", default=SITE_DIR,
+                   help="index.html 과 assets/ 를 쓸 폴더, data.csv·파티션과 같은 곳 (기본 %(default)s)")
+    p.add_argument("--render", action="store_true",
+                   help="수집 없이 templates/index.html 로 index.html 만 다시 만든다")
+    p.add_argument("--vendor", action="store_true",
+                   help="CDN 라이브러리를 vendor/ 에 받아 두고 index.html 을 다시 만든다 (네트워크 필요)")
+    p.add_argument("--shard", type=parse_shard, metavar="i/N",
+                   help="키워드를 N 개로 나눈 중 i 번째(0부터)만 수집해 --shard-dir 에 부분 결과를 쓴다")
+    p.add_argument("--merge", type=int, metavar="N",
+                   help="수집 없이 --shard 로 쓴 샤드 N 개의 결과를 합쳐 data.csv·파티션을 갱신한다")
+    p.add_argument("--shards", type=int, default=1, metavar="N",
+                   help="키워드를 N 개 프로세스로 나눠 수집한 뒤 합친다 (기본 %(default)s)")
+    p.add_argument("--shard-dir", default=SHARD_DIR,
+                   help="샤드 부분 결과를 쓸 폴더 (기본 %(default)s)")
+    p.add_argument("-o", "--output", default=DATA_FILE)
+    args = p.parse_args(argv)
+    if os.path.realpath(args.partition_dir) == os.path.dirname(os.path.realpath(args.output)):
+        p.error("--partition-dir 는 %s 가 있는 폴더와 달라야 합니다" % args.output)
+    if args.retention_days is not None and not args.compact:
+        p.error("--retention-days 는 --compact 와 함께 씁니다")
+    if args.merge is not None and args.merge < 1:
+        p.error("--merge 의 샤드 수는 1 이상이어야 합니다: %d" % args.merge)
+    if args.shards < 1:
+        p.error("--shards 는 1 이상이어야 합니다: %d" % args.shards)
+    return args
+
+
+def collect(args, report: RunReport, keywords: List[str], cache_file: str) -> List[dict]:
+    """키워드를 수집하고 수집 캐시를 저장한다. 결과는 키워드 순서를 따른다."""
+    if args.workers > args.per_host:
+        log.info("검색 호스트 동시 요청은 --per-host %d 까지라 스레드 %d개 중 나머지는 기다린다",
+                 args.per_host, args.workers)
+    fetcher = Fetcher(workers=args.workers, per_host=args.per_host,
+                      rate=args.rate, retries=args.retries)
+    cache = None if args.no_cache else FetchCache(cache_file, args.cache_size)
+    try:
+        with report.stage("crawl"):
+            rows = crawl(keywords, workers=args.workers, search_url=args.search_url,
+                         fetcher=fetcher, cache=cache, report=report)
+    finally:
+        fetcher.close()
+        report.add_fetcher(fetcher)
+    report.count("rows_collected", len(rows))
+    if cache:
+        cache.save()
+        report.add_cache(cache)
+        log.info("캐시 적중 %d / %d", cache.hits, cache.hits + cache.misses)
+    return rows
+
+
+def ingest(args, report: RunReport, rows: List[dict]) -> int:
+    """수집 결과를 중복 제거해 data.csv·색인·파티션에 반영하고 신규 건수를 돌려준다."""
+    with report.stage("dedup"):
+        index = DedupIndex(args.index_file, args.output)
+        stale = partitions_stale(args.partition_dir, args.output)
+    try:
+        with report.stage("dedup"):
+            fresh = index.filter_new(rows)
+            index.assign_clusters(fresh)
+        report.count("rows_new", len(fresh))
+        if args.enrich:
+            article_fetcher = Fetcher(workers=args.workers, per_host=args.enrich_per_host,
+                                      rate=args.rate, retries=args.retries,
+                                      host_delay=args.host_delay)
+            try:
+                with report.stage("enrich"):
+                    enriched = enrich(fresh, article_fetcher, args.workers, args.enrich_processes)
+            finally:
+                article_fetcher.close()
+                report.add_fetcher(article_fetcher)
+            report.count("rows_enriched", enriched)
+            log.info("본문 보강 %d / %d건", enriched, len(fresh))
+        with report.stage("write"):
+            append_csv(fresh, args.output)
+            index.add(fresh)
+    finally:
+        index.close()
+    with report.stage("write"):
+        if stale:
+            rebuild_partitions(read_csv(args.output), args.partition_dir, args.output)
+        else:
+            update_partitions(fresh, args.partition_dir, args.output)
+    return len(fresh)
+
+
+def run(args, report: RunReport):
+    """수집부터 파티션 갱신까지 한 번 돌리며 단계별 지표를 report 에 남긴다."""
+    keywords = load_keywords(args.keywords_file)
+    started = time.perf_counter()
+    rows = collect(args, report, keywords, args.cache_file)
+    if not rows:
+        log.error("수집된 기사가 없어 %s 를 갱신하지 않습니다.", args.output)
+        return
+    fresh = ingest(args, report, rows)
+    log.info("키워드 %d개, %d건 수집, 신규 %d건 추가 (%.1fs)", len(keywords), len(rows),
+             fresh, time.perf_counter() - started)
+
+
+def shard_of(keyword: str, shards: int) -> int:
+    """키워드가 맡겨질 샤드 번호.
+
+    hash() 는 프로세스마다 달라지므로 crc32 를 쓴다. 키워드 목록이 바뀌어도 같은
+    키워드는 같은 샤드로 가서 샤드별 수집 캐시가 계속 맞는다.
+    """
+    return zlib.crc32(keyword.encode("utf-8")) % shards
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    m = re.fullmatch(r"(\d+)/(\d+)", value.strip())
+    if not m or not int(m.group(1)) < int(m.group(2)):
+        raise argparse.ArgumentTypeError("i/N 형식이어야 합니다 (0 <= i < N): %r" % value)
+    return int(m.group(1)), int(m.group(2))
+
+
+def shard_path(folder: str, index: int, shards: int, ext: str = ".csv") -> str:
+    return os.path.join(folder, "shard-%dof%d%s" % (index, shards, ext))
+
+
+def shard_cache_file(path: str, index: int, shards: int) -> str:
+    """샤드마다 따로 쓰는 수집 캐시 파일 (여러 프로세스가 한 파일을 덮어쓰지 않도록)."""
+    root, ext = os.path.splitext(path)
+    return "%s.shard-%dof%d%s" % (root, index, shards, ext)
+
+
+def run_shard(args, index: int, shards: int, report: RunReport):
+    """index 번 샤드의 키워드만 수집해 shard_dir 에 부분 결과를 쓴다.
+
+    중복 제거와 data.csv·파티션 갱신은 merge_shards 가 한 번에 한다. 결과가 없어도
+    헤더만 있는 파일을 써서 이 샤드가 끝났음을 남긴다.
+    """
+    keywords = [kw for kw in dict.fromkeys(load_keywords(args.keywords_file))
+                if shard_of(kw, shards) == index]
+    rows = collect(args, report, keywords, shard_cache_file(args.cache_file, index, shards))
+    with report.stage("write"):
+        os.makedirs(args.shard_dir, exist_ok=True)
+        save_csv(rows, shard_path(args.shard_dir, index, shards))
+    log.info("샤드 %d/%d: 키워드 %d개, %d건 수집", index, shards, len(keywords), len(rows))
+
+
+def _shard_worker(args, index: int, shards: int) -> dict:
+    """--shards 프로세스 풀에서 샤드 하나를 돌리고 보고서를 돌려준다."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    report = RunReport()
+    run_shard(args, index, shards, report)
+    return report.to_dict()
+
+
+def merge_shards(args, shards: int, report: RunReport):
+    """샤드 부분 결과를 키워드 목록 순서로 이어 붙여 한 프로세스로 수집한 것과 같은
+    순서를 만든 뒤 run 과 같은 경로로 반영한다.
+
+    샤드 결과(이번 수집분)만 읽으므로 비용은 새로 수집한 행 수에 비례한다. 빠진
+    샤드가 있으면 일부 키워드만 반영되지 않도록 아무것도 쓰지 않고 실패한다.
+    """
+    paths = [shard_path(args.shard_dir, i, shards) for i in range(shards)]
+    missing = [p for p in paths if not os.path.exists(p)]
+    if missing:
+        raise FileNotFoundError("샤드 결과가 없습니다: %s" % ", ".join(missing))
+    started = time.perf_counter()
+    with report.stage("merge"):
+        by_keyword: Dict[str, List[dict]] = {}
+        for path in paths:
+            for row in read_csv(path):
+                by_keyword.setdefault(row["keyword"], []).append(row)
+            shard_report = os.path.splitext(path)[0] + ".json"
+            if os.path.exists(shard_report):
+                with open(shard_report, encoding="utf-8") as f:
+                    report.add_report(json.load(f))
+        keywords = load_keywords(args.keywords_file)
+        rows = [row for kw in keywords for row in by_keyword.get(kw, [])]
+        unknown = set(by_keyword) - set(keywords)
+        if unknown:
+            log.warning("키워드 목록에 없는 샤드 결과 %d개 키워드를 버립니다: %s",
+                        len(unknown), ", ".join(sorted(unknown)[:5]))
+    if not rows:
+        log.error("수집된 기사가 없어 %s 를 갱신하지 않습니다.", args.output)
+        return
+    fresh = ingest(args, report, rows)
+    for path in paths:
+        for ext in (".csv", ".json"):
+            try:
+                os.remove(os.path.splitext(path)[0] + ext)
+            except FileNotFoundError:
+                pass
+    log.info("샤드 %d개 합침: %d건, 신규 %d건 추가 (%.1fs)", shards, len(rows), fresh,
+             time.perf_counter() - started)
+
+
+def run_sharded(args, report: RunReport):
+    """--shards N: 샤드 N개를 프로세스 풀로 동시에 돌리고 바로 합친다.
+
+    한 컴퓨터에서 같은 IP 로 나가므로 --rate 는 샤드 수로 나눠 전체 한도를 지킨다.
+    """
+    shards = args.shards
+    shard_args = argparse.Namespace(**vars(args))
+    shard_args.rate = args.rate / shards
+    for i in range(shards):
+        for ext in (".csv", ".json"):
+            if os.path.exists(shard_path(args.shard_dir, i, shards, ext)):
+                os.remove(shard_path(args.shard_dir, i, shards, ext))
+    with ProcessPoolExecutor(max_workers=shards) as pool:
+        futures = [pool.submit(_shard_worker, shard_args, i, shards) for i in range(shards)]
+        for fut in futures:
+            report.add_report(fut.result())
+    merge_shards(args, shards, report)
+
+
+def render_dashboard(args, report: Optional[dict] = None):
+    """현재 manifest 와 실행 보고서로 index.html 과 assets/ 를 다시 만든다."""
+    if report is None:
+        try:
+            with open(args.report or os.path.join(args.partition_dir, REPORT_NAME),
+                      encoding="utf-8") as f:
+                report = json.load(f)
+        except (OSError, ValueError):
+            report = None
+    path = dashboard_build.render(args.site_dir, load_manifest(args.partition_dir), report,
+                                  KEYWORD_GROUPS)
+    log.info("대시보드 생성: %s", path)
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = parse_args(argv)
+    if args.vendor:
+        log.info("vendor/ 에 저장: %s", ", ".join(dashboard_build.vendor()))
+    if args.compact or args.reclassify:
+        if args.reclassify:
+            reclassify(args.output)
+        if args.compact:
+            compact(args.output, args.index_file, args.partition_dir, args.retention_days)
+        else:
+            rebuild_partitions(read_csv(args.output), args.partition_dir, args.output)
+        render_dashboard(args)
+        return
+    if args.render or args.vendor:
+        render_dashboard(args)
+        return
+    report = RunReport()
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    try:
+        if args.shard:
+            run_shard(args, *args.shard, report)
+        elif args.merge is not None:
+            merge_shards(args, args.merge, report)
+        elif args.shards > 1:
+            run_sharded(args, report)
+        else:
+            run(args, report)
+    except BaseException as e:
+        report.error = "%s: %s" % (type(e).__name__, e)
+        raise
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            log.info("프로파일 저장: %s", args.profile)
+        result = report.to_dict()
+        if args.shard:
+            # 샤드 보고서는 --merge 가 읽어 최종 보고서에 더한다
+            report_path = args.report or shard_path(args.shard_dir, *args.shard, ext=".json")
+        else:
+            report_path = args.report or os.path.join(args.partition_dir, REPORT_NAME)
+        report.save(report_path, result)
+        if args.metrics_file:
+            report.write_prometheus(args.metrics_file, result)
+        log.info("실행 보고서: %s, 최대 메모리 %s", result["status"],
+                 "%.1fMB" % (result["peak_rss"] / 1e6) if result["peak_rss"] else "-")
+        # 수집이 실패해도 실패 상태를 보여 주도록 페이지는 다시 만든다
+        if not args.shard:
+            try:
+                render_dashboard(args, result)
+            except Exception:
+                log.exception("대시보드를 만들지 못했습니다")
 
-        function updateCharts(data) {
-            const rCounts = { RED: 0, AMBER: 0, GREEN: 0 };
-            data.forEach(d => {
-                if (rCounts[d.risk] !== undefined) rCounts[d.risk]++;
-                else rCounts['GREEN']++;
-            });
-
-            const ctxRisk = document.getElementById("riskChart");
-            if (charts.risk) charts.risk.destroy();
-
-            charts.risk = new Chart(ctxRisk, {
-                type: "doughnut",
-                data: {
-                    labels: ["Critical", "Warning", "Safe"],
-                    datasets: [{
-                        data: [rCounts.RED, rCounts.AMBER, rCounts.GREEN],
-                        backgroundColor: ["#ef4444", "#f59e0b", "#22c55e"],
-                        borderWidth: 0,
-                        hoverOffset: 10
-                    }]
-                },
-                options: {
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    cutout: "75%",
-                    plugins: { legend: { position: 'right', labels: { boxWidth: 10, usePointStyle: true, font: { family: 'Pretendard', size: 11 } } } }
-                }
-            });
-        }
 
-        document.getElementById("filter-search").addEventListener("input", applyFilter);
-    </script>
-</body>
-</html>
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,562 @@
+"use strict";
+importScripts("https://cdnjs.cloudflare.com/ajax/libs/PapaParse/5.4.1/papaparse.min.js");
+const RISK_LEVELS = ["RED", "AMBER", "GREEN"];
+let KEYWORD_GROUPS = {};
+let rawData = [];
+const PARTITION_FETCHES = 6;   // 동시에 받는 파티션 수 (합치는 순서는 최신순 그대로)
+const PROGRESS_MS = 200;       // 로드 중 중간 결과를 다시 보내는 최소 간격
+let dataRoot = "";
+const PARTITION_DIR = "data/";
+let manifest = null;
+const loadedPartitions = new Set();
+let rollupDays = null;
+const searchIndex = new Map();
+const bySeq = [];
+let searchIndexReady = false;
+let nextSeq = 0;
+const SEARCH_SCAN_RATIO = 0.5;
+const DAY_MS = 86400000;
+function toItem(item) {
+const dateStr = item.date_fmt || item.date || "";
+const keyword = item.keyword ? item.keyword.trim() : "기타";
+const title = item.title ? item.title.trim() : "";
+return {
+keyword: keyword,
+title: title,
+link: (item.link && item.link.trim()) ? item.link.trim() : "#",
+date: dateStr,
+risk: item.risk ? item.risk.trim().toUpperCase() : "GREEN",
+rules: item.rules ? item.rules.split("|").join(", ") : "",
+cluster: item.cluster_id ? item.cluster_id.trim() : "",
+day: Math.floor(Date.parse(dateStr) / DAY_MS),
+text: (title + "\n" + keyword).toLowerCase()
+};
+}
+const isValidItem = item => item.title && !isNaN(item.day);
+const titleIds = new Map();
+const clusterIds = new Map();
+function internId(ids, key) {
+let id = ids.get(key);
+if (id === undefined) ids.set(key, id = ids.size);
+return id;
+}
+function appendRows(items) {
+const from = rawData.length;
+const valid = items.filter(isValidItem);
+for (const item of valid) {
+item.seq = nextSeq++;
+bySeq.push(item);
+item.titleId = internId(titleIds, item.title);
+item.clusterId = item.cluster ? internId(clusterIds, item.cluster) : -1;
+rawData.push(item);
+}
+for (let i = Math.max(1, from); i < rawData.length; i++) {
+if (rawData[i].day > rawData[i - 1].day) {
+rawData.sort((a, b) => b.day - a.day);
+indexRows(0);
+return;
+}
+}
+indexRows(from);
+}
+function resetData() {
+rawData = [];
+nextSeq = 0;
+bySeq.length = 0;
+titleIds.clear();
+clusterIds.clear();
+searchIndex.clear();
+loadedPartitions.clear();
+indexRows(0);
+}
+function parseCsv(url) {
+return new Promise((resolve, reject) => {
+Papa.parse(url, {
+download: true,
+header: true,
+skipEmptyLines: true,
+complete: results => resolve(results.data.map(toItem)),
+error: reject
+});
+});
+}
+const BUNDLE_INVALID_DAY = -2147483648;
+const utf8 = new TextDecoder();
+const dayLabels = new Map();
+function dayLabel(day) {
+let label = dayLabels.get(day);
+if (label === undefined) {
+label = isNaN(day) ? "" : new Date(day * DAY_MS).toISOString().slice(0, 10);
+dayLabels.set(day, label);
+}
+return label;
+}
+function decodeBundle(buf) {
+const bytes = new Uint8Array(buf);
+if (utf8.decode(bytes.subarray(0, 4)) !== "NWB1") throw new Error("bundle format");
+const headerLen = new DataView(buf).getUint32(4, true);
+const header = JSON.parse(utf8.decode(bytes.subarray(8, 8 + headerLen)));
+const n = header.rows;
+let pos = (8 + headerLen + 3) & ~3;
+const take = (Type, count) => {
+const arr = new Type(buf, pos, count);
+pos += arr.byteLength;
+return arr;
+};
+const days = take(Int32Array, n);
+const cols = {};
+header.text.forEach(([name]) => { cols[name] = { offsets: take(Uint32Array, n + 1) }; });
+const kwIds = take(Uint16Array, n);
+const riskIds = take(Uint8Array, n);
+header.text.forEach(([name, len]) => {
+cols[name].text = utf8.decode(bytes.subarray(pos, pos + len));
+pos += len;
+});
+const keywords = header.keywords.map(k => k.trim() || "기타");
+const risks = header.risks.map(r => r.trim().toUpperCase() || "GREEN");
+const field = (name, i) => {
+const col = cols[name];
+return col ? col.text.slice(col.offsets[i], col.offsets[i + 1]) : "";
+};
+const items = new Array(n);
+for (let i = 0; i < n; i++) {
+const day = days[i] === BUNDLE_INVALID_DAY ? NaN : days[i];
+const keyword = keywords[kwIds[i]];
+const title = field("title", i).trim();
+const link = field("link", i).trim();
+const rules = field("rules", i);
+items[i] = {
+keyword: keyword,
+title: title,
+link: link || "#",
+date: dayLabel(day),
+risk: risks[riskIds[i]],
+rules: rules ? rules.split("|").join(", ") : "",
+cluster: field("cluster_id", i).trim(),
+day: day,
+text: (title + "\n" + keyword).toLowerCase()
+};
+}
+return items;
+}
+async function fetchBundle(url) {
+const res = await fetch(url);
+if (!res.ok) throw new Error(res.status);
+const stream = res.body.pipeThrough(new DecompressionStream("gzip"));
+return decodeBundle(await new Response(stream).arrayBuffer());
+}
+function streamCsv(url, onRows) {
+return new Promise((resolve, reject) => {
+Papa.parse(url, {
+download: true,
+header: true,
+skipEmptyLines: true,
+chunk: results => onRows(results.data.map(toItem)),
+complete: () => resolve(),
+error: reject
+});
+});
+}
+function loadRows(p) {
+if (!p.bundle || typeof DecompressionStream === "undefined") {
+return parseCsv(dataRoot + PARTITION_DIR + p.file);
+}
+return fetchBundle(dataRoot + PARTITION_DIR + p.bundle)
+.catch(() => parseCsv(dataRoot + PARTITION_DIR + p.file));
+}
+async function loadPartition(p) {
+const [items, index] = await Promise.all([
+loadRows(p),
+p.index
+? fetch(dataRoot + PARTITION_DIR + p.index).then(res => res.ok ? res.json() : null).catch(() => null)
+: null
+]);
+return { items, index };
+}
+function addToSearchIndex(items, index) {
+const seqs = new Int32Array(items.length);
+items.forEach((item, i) => { seqs[i] = isValidItem(item) ? item.seq : -1; });
+Object.entries(index.grams).forEach(([gram, rows]) => {
+let post = searchIndex.get(gram);
+if (!post) searchIndex.set(gram, post = { ids: new Int32Array(Math.max(8, rows.length)), n: 0 });
+if (post.n + rows.length > post.ids.length) {
+const ids = new Int32Array(Math.max(post.n + rows.length, post.ids.length * 2));
+ids.set(post.ids.subarray(0, post.n));
+post.ids = ids;
+}
+for (const i of rows) {
+if (seqs[i] >= 0) post.ids[post.n++] = seqs[i];
+}
+});
+}
+function queryGrams(q) {
+if (q.length === 1) return q.trim() ? [q] : [];
+const grams = [];
+for (let i = 0; i < q.length - 1; i++) {
+const g = q.substring(i, i + 2);
+if (g.trim()) grams.push(g);
+}
+return grams;
+}
+function intersect(a, n, b, m) {
+const out = new Int32Array(Math.min(n, m));
+let i = 0, j = 0, k = 0;
+while (i < n && j < m) {
+const x = a[i], y = b[j];
+if (x === y) { out[k++] = x; i++; j++; }
+else if (x < y) i++;
+else j++;
+}
+return out.subarray(0, k);
+}
+function searchCandidates(searchVal) {
+if (!searchVal || !searchIndexReady) return null;
+const grams = queryGrams(searchVal);
+if (grams.length === 0) return null;
+const lists = [];
+for (const g of grams) {
+const post = searchIndex.get(g);
+if (!post) return new Int32Array(0);
+lists.push(post);
+}
+lists.sort((a, b) => a.n - b.n);
+if (lists[0].n > rawData.length * SEARCH_SCAN_RATIO) return null;
+let result = lists[0].ids.subarray(0, lists[0].n);
+for (let k = 1; k < lists.length && result.length > 0; k++) {
+result = intersect(result, result.length, lists[k].ids, lists[k].n);
+}
+return result;
+}
+function getDateCutoff(range) {
+if (range === "ALL") return null;
+const cutoff = new Date();
+cutoff.setHours(0,0,0,0);
+cutoff.setDate(cutoff.getDate() - (parseInt(range) - 1));
+return cutoff;
+}
+function toDateStr(d) {
+const pad = n => String(n).padStart(2, "0");
+return `${d.getFullYear()}-${pad(d.getMonth() + 1)}-${pad(d.getDate())}`;
+}
+async function ensureRange(range) {
+if (!manifest) return;
+const cutoff = getDateCutoff(range);
+const cutoffStr = cutoff ? toDateStr(cutoff) : "";
+let rollupsLoad = null;
+if (rollupDays === null && manifest.rollups && (!cutoffStr || cutoffStr <= manifest.rollups.newest)) {
+rollupDays = [];
+rollupsLoad = loadRollups(manifest.rollups.file);
+}
+const pending = manifest.partitions.filter(p => p.date >= cutoffStr && !loadedPartitions.has(p.file));
+if (pending.length === 0) {
+if (rollupsLoad) {
+rollupDays = await rollupsLoad;
+notifyProgress(true);
+}
+return;
+}
+pending.forEach(p => loadedPartitions.add(p.file));
+const inflight = pending.slice(0, PARTITION_FETCHES).map(loadPartition);
+for (let k = 0; k < pending.length; k++) {
+let chunk;
+try {
+chunk = await inflight[k];
+} catch (err) {
+pending.slice(k).forEach(p => loadedPartitions.delete(p.file));
+throw err;
+}
+if (inflight.length < pending.length) inflight.push(loadPartition(pending[inflight.length]));
+const { items, index } = chunk;
+appendRows(items);
+if (index && index.rows === items.length) addToSearchIndex(items, index);
+else searchIndexReady = false;
+notifyProgress(false);
+}
+if (rollupsLoad) rollupDays = await rollupsLoad;
+notifyProgress(true);
+}
+async function loadRollups(file) {
+try {
+const res = await fetch(dataRoot + PARTITION_DIR + file);
+if (!res.ok) return [];
+return (await res.text()).split("\n").filter(line => line.trim()).map(line => JSON.parse(line));
+} catch (err) {
+console.error("일별 집계 로드 실패", err);
+return [];
+}
+}
+async function loadData(range, snapshot) {
+rollupDays = null;
+try {
+if (snapshot) {
+manifest = snapshot;
+} else {
+const res = await fetch(dataRoot + PARTITION_DIR + "manifest.json", { cache: "no-cache" });
+if (!res.ok) throw new Error(res.status);
+manifest = await res.json();
+}
+searchIndexReady = true;
+await ensureRange(range);
+if (!progressed) notifyProgress(true);
+} catch (err) {
+manifest = null;
+searchIndexReady = false;
+resetData();
+await streamCsv(dataRoot + "data.csv", items => {
+appendRows(items);
+notifyProgress(false);
+});
+notifyProgress(true);
+}
+}
+const filterMembersCache = new Map();
+function filterMembers(value) {
+if (value === "ALL") return null;
+let members = filterMembersCache.get(value);
+if (!members) {
+if (manifest && manifest.filters) {
+members = new Set(manifest.filters[value] || []);
+} else {
+const patterns = value.startsWith("GROUP:") ? KEYWORD_GROUPS[value.slice(6)] || [] : [value];
+members = new Set([...rowIndex.keywords.keys()].filter(kw =>
+patterns.some(k => kw.includes(k) || k.includes(kw))));
+}
+filterMembersCache.set(value, members);
+}
+return members;
+}
+const rowIndex = { words: 0, capacity: 0, keywords: new Map(), risk: {}, filters: new Map() };
+function growBits(bits, capacity) {
+const out = new Int32Array(capacity);
+out.set(bits);
+return out;
+}
+function indexRows(from) {
+if (from === 0) {
+Object.assign(rowIndex, { capacity: 0, keywords: new Map(), risk: { RED: [], AMBER: [], GREEN: [] } });
+}
+const words = (rawData.length + 31) >>> 5;
+if (words > rowIndex.capacity) {
+const capacity = Math.max(words, rowIndex.capacity * 2);
+rowIndex.keywords.forEach((bits, kw) => rowIndex.keywords.set(kw, growBits(bits, capacity)));
+RISK_LEVELS.forEach(level => { rowIndex.risk[level] = growBits(rowIndex.risk[level], capacity); });
+rowIndex.capacity = capacity;
+}
+const { keywords, risk } = rowIndex;
+let newKeyword = false;
+for (let i = from; i < rawData.length; i++) {
+const d = rawData[i];
+d.row = i;
+let bits = keywords.get(d.keyword);
+if (!bits) {
+keywords.set(d.keyword, bits = new Int32Array(rowIndex.capacity));
+newKeyword = true;
+}
+bits[i >>> 5] |= 1 << (i & 31);
+(risk[d.risk] || risk.GREEN)[i >>> 5] |= 1 << (i & 31);
+}
+rowIndex.words = words;
+rowIndex.filters = new Map();
+if (!manifest && (newKeyword || from === 0)) filterMembersCache.clear();
+}
+function keywordBits(value) {
+const members = filterMembers(value);
+if (!members) return null;
+let bits = rowIndex.filters.get(value);
+if (!bits) {
+bits = new Int32Array(rowIndex.words);
+members.forEach(kw => {
+const kwBits = rowIndex.keywords.get(kw);
+if (kwBits) for (let w = 0; w < rowIndex.words; w++) bits[w] |= kwBits[w];
+});
+rowIndex.filters.set(value, bits);
+}
+return bits;
+}
+function andBits(a, b) {
+if (!a || !b) return a || b;
+const out = new Int32Array(rowIndex.words);
+for (let w = 0; w < out.length; w++) out[w] = a[w] & b[w];
+return out;
+}
+function rowsSince(cutoffStr) {
+let lo = 0, hi = rawData.length;
+while (lo < hi) {
+const mid = (lo + hi) >>> 1;
+if (rawData[mid].date >= cutoffStr) lo = mid + 1;
+else hi = mid;
+}
+return lo;
+}
+function filterRows(keyword, risk, searchVal, cutoffStr) {
+const end = rowsSince(cutoffStr);
+const mask = andBits(keywordBits(keyword), risk === "ALL" ? null : rowIndex.risk[risk]);
+const candidates = searchCandidates(searchVal);
+if (candidates) {
+const exact = searchVal.length <= 2;
+const out = [];
+for (let k = 0; k < candidates.length; k++) {
+const d = bySeq[candidates[k]];
+if (d.row < end && (!mask || mask[d.row >>> 5] & (1 << (d.row & 31))) &&
+(exact || d.text.includes(searchVal))) out.push(d);
+}
+return out;
+}
+if (!mask) {
+return searchVal
+? rawData.slice(0, end).filter(d => d.text.includes(searchVal))
+: rawData.slice(0, end);
+}
+const rows = rawData, out = [];
+for (let w = 0, last = (end + 31) >>> 5; w < last; w++) {
+const x = mask[w];
+if (x === 0) continue;
+for (let b = 0, i = w << 5; b < 32 && i < end; b++, i++) {
+if ((x >>> b) & 1 && (!searchVal || rows[i].text.includes(searchVal))) out.push(rows[i]);
+}
+}
+return out;
+}
+function summarize(data, keyword, risk, searchVal, cutoffStr) {
+const stats = { total: 0, risk: { RED: 0, AMBER: 0, GREEN: 0 }, kwCounts: new Map(), daily: new Map(), topKw: "-" };
+const useCube = !searchVal && manifest && manifest.version >= 2;
+if (useCube) {
+const members = filterMembers(keyword);
+const riskSlot = RISK_LEVELS.indexOf(risk);
+manifest.partitions.concat(rollupDays || []).forEach(p => {
+if (p.date < cutoffStr) return;
+const day = [0, 0, 0];
+stats.daily.set(p.date, day);
+Object.entries(p.keywords).forEach(([kw, cell]) => {
+if (members && !members.has(kw)) return;
+if (riskSlot >= 0) cell = cell.map((n, k) => k === riskSlot ? n : 0);
+stats.risk.RED += cell[0];
+stats.risk.AMBER += cell[1];
+stats.risk.GREEN += cell[2];
+day[0] += cell[0];
+day[1] += cell[1];
+day[2] += cell[2];
+stats.kwCounts.set(kw, (stats.kwCounts.get(kw) || 0) + cell[0] + cell[1] + cell[2]);
+});
+});
+stats.total = stats.risk.RED + stats.risk.AMBER + stats.risk.GREEN;
+} else {
+const slot = { RED: 0, AMBER: 1, GREEN: 2 };
+data.forEach(d => {
+const risk = slot[d.risk] !== undefined ? d.risk : "GREEN";
+stats.risk[risk]++;
+let day = stats.daily.get(d.date);
+if (!day) stats.daily.set(d.date, day = [0, 0, 0]);
+day[slot[risk]]++;
+stats.kwCounts.set(d.keyword, (stats.kwCounts.get(d.keyword) || 0) + 1);
+});
+stats.total = data.length;
+}
+let topCount = 0;
+stats.kwCounts.forEach((count, kw) => {
+if (count > topCount) { topCount = count; stats.topKw = kw; }
+});
+return stats;
+}
+let current = { id: 0, feed: [] };
+let lastFilter = null;
+let pendingFilter = null;
+let filterScheduled = false;
+let loadChain = Promise.resolve();
+let lastProgress = 0;
+let progressed = false;  // 첫 조각이 오기 전의 필터 요청은 기억만 해 둔다
+function cardRow(d) {
+return { keyword: d.keyword, title: d.title, link: d.link, date: d.date,
+risk: d.risk, rules: d.rules, similar: d.similar || 0 };
+}
+function sliceRows(start, end) {
+return current.feed.slice(start, end).map(cardRow);
+}
+let titleSeen = new Int32Array(0);
+let clusterSeen = new Int32Array(0);
+const clusterHead = [];
+let feedGen = 0;
+function dedupeFeed(data) {
+feedGen++;
+if (titleSeen.length < titleIds.size) titleSeen = new Int32Array(titleIds.size * 2);
+if (clusterSeen.length < clusterIds.size) clusterSeen = new Int32Array(clusterIds.size * 2);
+const feed = [];
+for (const d of data) {
+const c = d.clusterId;
+if (c >= 0 && clusterSeen[c] === feedGen) {
+clusterHead[c].similar++;
+} else if (titleSeen[d.titleId] !== feedGen) {
+titleSeen[d.titleId] = feedGen;
+d.similar = 0;
+if (c >= 0) {
+clusterSeen[c] = feedGen;
+clusterHead[c] = d;
+}
+feed.push(d);
+}
+}
+return feed;
+}
+function runFilter(msg) {
+const cutoff = getDateCutoff(msg.range);
+const cutoffStr = cutoff ? toDateStr(cutoff) : "";
+const data = filterRows(msg.keyword, msg.risk, msg.search, cutoffStr);
+const stats = summarize(data, msg.keyword, msg.risk, msg.search, cutoffStr);
+const criticals = [];
+const seenStories = new Set();
+for (const d of data) {
+if (d.risk !== 'RED' || seenStories.has(d.cluster || d.title)) continue;
+seenStories.add(d.cluster || d.title);
+criticals.push(d.title);
+if (criticals.length === 3) break;
+}
+current = { id: msg.id, feed: dedupeFeed(data) };
+delete stats.kwCounts;
+return {
+type: "result", id: msg.id, stats, criticals,
+feedLength: current.feed.length, start: msg.start, items: sliceRows(msg.start, msg.end)
+};
+}
+function buttonValues() {
+const values = Object.entries(KEYWORD_GROUPS).flatMap(([name, kws]) => [`GROUP:${name}`, ...kws]);
+return values.filter(v => filterMembers(v).size > 0);
+}
+function notifyProgress(done) {
+const now = Date.now();
+if (!done && lastProgress && now - lastProgress < PROGRESS_MS) return;
+lastProgress = done ? 0 : now;
+progressed = true;
+postMessage({ type: "progress", rows: rawData.length, done, buttons: buttonValues() });
+if (lastFilter) scheduleFilter(pendingFilter || lastFilter);
+}
+function scheduleFilter(msg) {
+pendingFilter = msg;
+if (filterScheduled) return;
+filterScheduled = true;
+setTimeout(() => {
+filterScheduled = false;
+const next = pendingFilter;
+pendingFilter = null;
+if (next) postMessage(runFilter(next));
+}, 0);
+}
+function requestRange(range) {
+loadChain = loadChain
+.then(() => ensureRange(range))
+.catch(err => console.error("파티션 로드 실패", err));
+}
+self.onmessage = e => {
+const msg = e.data;
+if (msg.type === "load") {
+KEYWORD_GROUPS = msg.groups;
+dataRoot = msg.root || "";
+loadChain = loadData(msg.range, msg.manifest)
+.catch(err => postMessage({ type: "error", message: String(err) }));
+} else if (msg.type === "filter") {
+lastFilter = msg;
+if (manifest) requestRange(msg.range);
+if (progressed) scheduleFilter(msg);
+} else if (msg.type === "slice" && msg.id === current.id) {
+postMessage({ type: "slice", id: msg.id, start: msg.start, items: sliceRows(msg.start, msg.end) });
+}
+};
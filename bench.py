@@ -0,0 +1,778 @@
+# -*- coding: utf-8 -*-
+"""오프라인 크롤러 벤치마크.
+
+로컬 스텁 HTTP 서버가 검색 결과 페이지를 흉내 내므로 실제 뉴스 사이트에
+접속하지 않고 app.py 수집 처리량을 잰다.
+
+    python bench.py crawl                       # 키워드 200개, 워커 1/8/32 비교 (한도 없이 / 기본 한도)
+    python bench.py crawl -n 500 -w 16 --latency 0.2
+    python bench.py append --history 1000 100000 1000000  # 추가 시간이 이력과 무관한지 (1k 의 3배 안)
+    python bench.py search --rows 100000      # node 로 대시보드 검색 지연 측정
+    python bench.py feed --rows 100000 --csv-only
+    python bench.py bundle --rows 10000 100000 1000000  # CSV 대비 열 단위 묶음 크기·파싱
+    python bench.py load --rows 10000 100000 --csv-only  # 이력 크기별 첫 카드까지의 시간
+    python bench.py enrich -n 400             # fixtures/articles 본문 보강 처리량
+    python bench.py classify -n 1000000       # 규칙 수별 위험도 분류 처리량
+    python bench.py shards -n 2000 --shards 1 4 8  # 샤드 수집+병합 결과가 같은지와 시간
+    python bench.py compact                    # 이력 100k/1M/15M(약 2GB) 압축 최대 메모리 상한
+    python bench.py generate --rows 1000 100000 1000000 -o bench_data  # 합성 data.csv + 파티션
+    python bench.py suite                     # 전체 경로를 재고 bench_baseline.json 과 비교
+    python bench.py suite --sizes 1000 100000 1000000 --save-baseline
+
+suite 는 fixtures/search 의 기록된 검색 결과 페이지로 수집부터 파티션 쓰기까지
+app.run 전체를 돌리고, 이력 크기별로 분류·중복 제거·파일 쓰기·대시보드 렌더링
+시간을 잰다. 기준값보다 --threshold 비율 이상 느려진 항목이 있으면 종료 코드 1.
+기준값은 그것을 잰 기계에서만 의미가 있으니 기계를 바꾸면 --save-baseline 으로 다시 잰다.
+"""
+import argparse
+import datetime
+import gzip
+import hashlib
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+import app
+import dashboard_build
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(HERE, "fixtures", "articles")
+SEARCH_FIXTURE_DIR = os.path.join(HERE, "fixtures", "search")
+BASELINE_FILE = os.path.join(HERE, "bench_baseline.json")
+REGRESSION_THRESHOLD = 0.3  # 기준값보다 이 비율 이상 느리면 회귀
+MIN_DELTA = 0.05             # 이보다 작은 차이(초)는 측정 잡음으로 본다
+# 수집 스레드들의 시간을 더한 값이라 GIL 경합에 따라 크게 흔들린다. 보여 주기만 하고
+# 회귀 판정은 벽시계 시간(crawl.total)으로 한다
+INFO_METRICS = {"crawl.fetch", "crawl.parse", "crawl.classify"}
+COMPACT_RSS_CEILING = 150  # MB, --compact 최대 메모리 상한 (이력 크기와 무관해야 한다)
+APPEND_SLOWDOWN = 3.0      # 가장 큰 이력의 추가 시간이 가장 작은 이력의 몇 배까지 괜찮은가
+# normalize_url 이 같은 기사로 봐야 하는 링크 (data.csv 에 실제로 있던 모양)
+NORMALIZE_CASES = [
+    ("https://www.boannews.com/media/view.asp?idx=140881&amp;kind=1",
+     "boannews.com/media/view.asp?idx=140881&kind=1"),
+    ("https://v.daum.net/v/20251216163757176?f=p", "v.daum.net/v/20251216163757176"),
+    ("https://m.boannews.com/html//detail.html?idx=140881", "boannews.com/html/detail.html?idx=140881"),
+]
+
+RESULT_TEMPLATE = (
+    '<div class="news_area">'
+    '<a href="https://news.example.com/{kw_id}/{i}" class="news_tit" title="{title}">{title}</a>'
+    '</div>'
+)
+
+
+def search_page(query: str, items: int = 10) -> str:
+    kw_id = abs(hash(query)) % 100000
+    body = "".join(
+        RESULT_TEMPLATE.format(kw_id=kw_id, i=i, title=f"{query} 관련 보도 {i} 해킹 피해 조사")
+        for i in range(items)
+    )
+    return f"<html><body><ul class='list_news'>{body}</ul></body></html>"
+
+
+def read_fixtures(folder: str):
+    return [open(os.path.join(folder, name), "rb").read()
+            for name in sorted(os.listdir(folder)) if name.endswith(".html")]
+
+
+class StubNewsServer:
+    """검색 결과 페이지를 돌려주는 로컬 HTTP 서버.
+
+    latency 만큼 응답을 늦춰 실제 사이트의 네트워크 지연을 흉내 낸다.
+    ETag 를 붙이고 If-None-Match 가 맞으면 304 를 돌려준다. /article/<n> 은
+    fixtures/articles 의 기사 페이지를 돌아가며 돌려준다. recorded 면 검색 결과도
+    합성 페이지 대신 fixtures/search 에 기록해 둔 페이지 중 하나를 키워드별로 고정해 준다.
+    with 문으로 쓰면 백그라운드 스레드에서 띄우고 끝나면 내린다.
+    """
+
+    def __init__(self, latency: float = 0.1, host: str = "127.0.0.1", port: int = 0,
+                 recorded: bool = False):
+        self.latency = latency
+        self.recorded = recorded
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server.requests += 1
+                url = urlparse(self.path)
+                time.sleep(server.latency)
+                if url.path.startswith("/article/"):
+                    n = int(url.path.rsplit("/", 1)[-1])
+                    body = server.articles[n % len(server.articles)]
+                else:
+                    query = parse_qs(url.query).get("query", [""])[0]
+                    if server.recorded:
+                        pages = server.search_pages
+                        body = pages[zlib.crc32(query.encode("utf-8")) % len(pages)]
+                    else:
+                        body = search_page(query).encode("utf-8")
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.requests = 0
+        self.not_modified = 0
+        self.articles = read_fixtures(FIXTURE_DIR)
+        self.search_pages = read_fixtures(SEARCH_FIXTURE_DIR)
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def search_url(self) -> str:
+        return self.base_url + "/search?query={query}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def bench_crawl(server: StubNewsServer, keywords, workers: int, cache=None,
+                limits: bool = False) -> float:
+    """limits 가 참이면 app.py 기본 한도(PER_HOST_LIMIT, RATE_LIMIT)로, 아니면 한도 없이 잰다."""
+    if limits:
+        fetcher = app.Fetcher(workers=workers)
+    else:
+        fetcher = app.Fetcher(workers=workers, per_host=workers, rate=0)
+    started = time.perf_counter()
+    try:
+        rows = app.crawl(keywords, workers=workers, search_url=server.search_url,
+                         fetcher=fetcher, cache=cache)
+    finally:
+        fetcher.close()
+    elapsed = time.perf_counter() - started
+    assert len(rows) == len(keywords) * app.MAX_ITEMS_PER_KEYWORD
+    return elapsed
+
+
+TITLE_WORDS = [
+    "보안", "해킹", "개인정보", "유출", "랜섬웨어", "관제", "CCTV", "AI", "스마트",
+    "안전", "산업재해", "화재", "점검", "정부", "과징금", "조사", "서비스", "출시",
+    "쿠팡", "통신사", "KT", "SK", "LG", "삼성", "애플", "아이폰", "갤럭시", "클라우드",
+    "금융", "은행", "카드", "병원", "학교", "공공기관", "지자체", "경찰", "검찰", "국회",
+    "법안", "개정안", "상임위", "통과", "과태료", "영업정지", "공시", "소송", "피해자",
+    "고객", "회원", "계정", "비밀번호", "인증", "탈취", "악성코드", "피싱", "스미싱",
+    "취약점", "패치", "업데이트", "침해", "사고", "대응", "복구", "백업", "데이터",
+    "서버", "네트워크", "방화벽", "관제센터", "출입통제", "무인", "경비", "순찰", "드론",
+    "로봇", "플랫폼", "솔루션", "매출", "실적", "투자", "인수", "합병", "상장", "주가",
+    "공장", "건설현장", "근로자", "사망", "부상", "붕괴", "폭발", "가스", "누출", "대피",
+    "점검반", "특별감독", "중대재해", "처벌법", "노동부", "장관", "대표", "임원", "책임",
+    "北", "해커", "공격", "사이버", "위협", "보고서", "분석", "전망", "시장", "경쟁",
+]
+
+
+def synthetic_rows(n: int, seed: int = 0, start: str = "2025-12-19"):
+    """최신순으로 정렬된 가짜 기사 n건을 만든다 (하루 약 200건)."""
+    rng = random.Random(seed)
+    day0 = datetime.date.fromisoformat(start)
+    for i in range(n):
+        words = rng.sample(TITLE_WORDS, rng.randint(4, 7))
+        title = f"{' '.join(words)} ({seed}-{i})"
+        yield {
+            "keyword": rng.choice(app.KEYWORDS),
+            "title": title,
+            "link": f"https://news.example.com/article/{seed}/{i}?f=p",
+            "date": (day0 - datetime.timedelta(days=i // 200)).isoformat(),
+            "risk": app.classify_risk(title),
+        }
+
+
+def run_crawl(args):
+    keywords = [f"키워드{i}" for i in range(args.keywords)]
+    with StubNewsServer(latency=args.latency) as server:
+        # 한도 없이 잰 값은 스레드 수의 효과, 기본 한도로 잰 값은 실제 실행에서 나오는 값이다.
+        # 검색은 한 호스트로 가므로 기본값에서는 --per-host 와 --rate 가 상한이 된다
+        for limits in (False, True):
+            label = (f"per_host={app.PER_HOST_LIMIT} rate={app.RATE_LIMIT:g}" if limits
+                     else "limits=off")
+            for workers in args.workers:
+                elapsed = bench_crawl(server, keywords, workers, limits=limits)
+                print(f"crawl  keywords={len(keywords):<5} workers={workers:<3} {label:<18} "
+                      f"{elapsed:7.2f}s  {len(keywords) / elapsed:8.1f} kw/s")
+
+        workers = max(args.workers)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.json")
+            for label in ("cold", "warm"):
+                cache = app.FetchCache(path)
+                elapsed = bench_crawl(server, keywords, workers, cache=cache)
+                cache.save()
+                print(f"cache  {label:<4} workers={workers:<3} {elapsed:7.2f}s  "
+                      f"hits={cache.hits} misses={cache.misses}")
+
+
+def run_append(args):
+    """누적 이력 크기별로 신규 batch 건 추가 시간을 잰다. 이력과 무관하게 평평해야 한다.
+
+    유사 기사 묶기 창(CLUSTER_WINDOW_DAYS)이 차도록 오늘 날짜부터 거슬러 만든다.
+    크기마다 --repeat 번 추가한 중앙값을 쓰고, 가장 큰 이력이 가장 작은 이력의
+    --max-slowdown 배를 넘거나 normalize_url 이 NORMALIZE_CASES 와 다르면 종료 코드 1.
+    """
+    failed = False
+    for link, want in NORMALIZE_CASES:
+        got = app.normalize_url(link)
+        if got != want:
+            failed = True
+            print(f"normalize {link} -> {got} (기대값 {want})")
+
+    today = datetime.datetime.now(app.KST).date().isoformat()
+    medians = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.history:
+            data = os.path.join(tmp, f"data_{size}.csv")
+            index_path = os.path.join(tmp, f"index_{size}.db")
+            app.save_csv(synthetic_rows(size, start=today), data)
+            started = time.perf_counter()
+            index = app.DedupIndex(index_path, data)
+            build = time.perf_counter() - started
+
+            samples = []
+            for r in range(args.repeat):
+                # 절반은 이미 있는 기사, 절반은 신규
+                fresh = list(synthetic_rows(args.batch // 2, seed=size + 1 + r, start=today))
+                dupes = list(synthetic_rows(args.batch - len(fresh), start=today))
+                started = time.perf_counter()
+                new_rows = index.filter_new(fresh + dupes)
+                index.assign_clusters(new_rows)
+                app.append_csv(new_rows, data)
+                index.add(new_rows)
+                samples.append(time.perf_counter() - started)
+                assert len(new_rows) == len(fresh)
+            index.close()
+            medians[size] = statistics.median(samples)
+            print(f"append history={size:<8} batch={args.batch:<5} {medians[size] * 1000:8.1f}ms  "
+                  f"(중앙값 {args.repeat}회, 색인 초기 구성 {build:.1f}s)")
+
+    smallest, largest = min(medians), max(medians)
+    if largest != smallest:
+        ratio = medians[largest] / medians[smallest]
+        ok = ratio <= args.max_slowdown
+        failed = failed or not ok
+        print(f"append history {smallest} -> {largest}: x{ratio:.2f} "
+              f"{'ok' if ok else 'OVER x%.1f' % args.max_slowdown}")
+    if failed:
+        sys.exit(1)
+
+
+def run_classify(args):
+    """헤드라인 n건 분류 시간. 규칙을 늘려도 오토마톤은 평평하고 단순 비교는 늘어난다."""
+    titles = [row["title"] for row in synthetic_rows(args.headlines)]
+    base = app.get_classifier()
+    for extra in args.extra_rules:
+        rules = dict(base.weights)
+        rules.update((f"가상규칙{i:05d}", 1) for i in range(extra))
+        classifier = app.RiskClassifier(rules, dict(base.thresholds))
+
+        started = time.perf_counter()
+        for i in range(0, len(titles), args.batch):
+            classifier.classify_batch(titles[i:i + args.batch])
+        elapsed = time.perf_counter() - started
+        print(f"classify automaton rules={len(rules):<6} headlines={len(titles)} "
+              f"{elapsed:7.2f}s  {len(titles) / elapsed / 1000:8.1f}k/s")
+
+        # 비교용: 규칙마다 부분 문자열 검색 (예전 방식)
+        sample = titles[:max(1, len(titles) // 10)]
+        terms = list(rules)
+        started = time.perf_counter()
+        for title in sample:
+            [t for t in terms if t in title]
+        elapsed = (time.perf_counter() - started) * len(titles) / len(sample)
+        print(f"classify substring rules={len(rules):<6} headlines={len(titles)} "
+              f"{elapsed:7.2f}s  {len(titles) / elapsed / 1000:8.1f}k/s  (1/10 표본에서 환산)")
+
+
+def run_enrich(args):
+    """언론사 여러 곳(포트가 다른 스텁 서버)의 기사 n건을 보강하는 처리량.
+
+    파싱을 현재 프로세스에서 할 때와 프로세스 풀에서 할 때를 비교한다.
+    """
+    servers = [StubNewsServer(latency=args.latency) for _ in range(args.hosts)]
+    for server in servers:
+        server.__enter__()
+    try:
+        for processes in args.processes:
+            rows = [{"title": f"기사 {i}", "risk": "GREEN",
+                     "link": f"{servers[i % len(servers)].base_url}/article/{i}"}
+                    for i in range(args.articles)]
+            fetcher = app.Fetcher(workers=args.workers, per_host=args.per_host, rate=0)
+            started = time.perf_counter()
+            try:
+                done = app.enrich(rows, fetcher, args.workers, processes, path=None)
+            finally:
+                fetcher.close()
+            elapsed = time.perf_counter() - started
+            assert done == len(rows)
+            print(f"enrich articles={len(rows):<5} processes={processes:<3} {elapsed:7.2f}s  "
+                  f"{len(rows) / elapsed:8.1f} articles/s")
+    finally:
+        for server in servers:
+            server.__exit__(None, None, None)
+
+
+def run_shards(args):
+    """기록된 검색 결과로 --shards N 수집+병합을 돌려 한 프로세스 결과와 같은지 확인하고
+    시간을 비교한다."""
+    today = datetime.datetime.now(app.KST).date().isoformat()
+    expected = None
+    with tempfile.TemporaryDirectory() as tmp, \
+            StubNewsServer(latency=args.latency, recorded=True) as server:
+        keywords_file = os.path.join(tmp, "keywords.txt")
+        with open(keywords_file, "w", encoding="utf-8") as f:
+            f.writelines(f"키워드{i}\n" for i in range(args.keywords))
+        for shards in args.shards:
+            root = os.path.join(tmp, f"shards{shards}")
+            os.makedirs(root)
+            data = os.path.join(root, app.DATA_FILE)
+            app.save_csv(synthetic_rows(args.history, start=today), data)
+            run_args = app.parse_args([
+                "-k", keywords_file, "-w", str(args.workers), "--per-host", str(args.workers),
+                "--rate", "0", "--search-url", server.search_url, "-o", data,
+                "--partition-dir", os.path.join(root, app.PARTITION_DIR),
+                "--index-file", os.path.join(root, "index.db"),
+                "--cache-file", os.path.join(root, "cache.json"),
+                "--shard-dir", os.path.join(root, "shards"), "--shards", str(shards),
+            ])
+            report = app.RunReport()
+            started = time.perf_counter()
+            if shards > 1:
+                app.run_sharded(run_args, report)
+            else:
+                app.run(run_args, report)
+            elapsed = time.perf_counter() - started
+            result = report.to_dict()
+            assert result["status"] == "ok", result
+            with open(data, "rb") as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+            expected = expected or digest
+            print(f"shards={shards:<3} keywords={args.keywords:<5} {elapsed:7.2f}s  "
+                  f"new={result['counts'].get('rows_new', 0)}  "
+                  f"{'same' if digest == expected else 'DIFFERENT'}")
+            assert digest == expected, "샤드 결과가 한 프로세스 결과와 다릅니다"
+
+
+def write_dataset(root: str, rows: int, csv_only: bool = False, start: str = "2025-12-19"):
+    """root 에 data.csv 와 (csv_only 가 아니면) data/ 파티션을 합성 데이터로 만들고
+    그 데이터로 index.html 을 렌더링한다."""
+    data = os.path.join(root, app.DATA_FILE)
+    app.save_csv(synthetic_rows(rows, start=start), data)
+    manifest = None
+    if not csv_only:
+        manifest = app.rebuild_partitions(app.read_csv(data), os.path.join(root, app.PARTITION_DIR), data)
+    dashboard_build.render(root, manifest, None, app.KEYWORD_GROUPS)
+
+
+def run_dashboard(suite: str, args, rows: Optional[int] = None, start: str = "2025-12-19"):
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_dashboard.js")
+    rows = rows or args.rows
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        write_dataset(tmp, rows, getattr(args, "csv_only", False), start)
+        print(f"build  rows={rows:<8} {time.perf_counter() - started:7.2f}s")
+        subprocess.run(["node", "--max-old-space-size=4096", script, suite, tmp], check=True)
+
+
+def run_bundle(args):
+    """같은 합성 행을 CSV 와 열 단위 묶음으로 써서 크기와 대시보드 파싱 시간을 비교한다."""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_dashboard.js")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "bench.csv")
+            app.save_csv(synthetic_rows(rows), csv_path)
+            started = time.perf_counter()
+            bundle = app.build_bundle(app.read_csv(csv_path))
+            build = time.perf_counter() - started
+            with open(os.path.join(tmp, "bench.bin"), "wb") as f:
+                f.write(bundle)
+            dashboard_build.render(tmp, None, None, app.KEYWORD_GROUPS)
+            with open(csv_path, "rb") as f:
+                raw = f.read()
+            print(f"size   rows={rows:<8} csv={len(raw) / 1e6:7.2f}MB  "
+                  f"csv.gz={len(gzip.compress(raw)) / 1e6:6.2f}MB  "
+                  f"bundle={len(bundle) / 1e6:6.2f}MB  (묶음 생성 {build:.1f}s)")
+            # 1M 행 CSV 는 node 기본 힙(약 2GB)을 넘는다
+            subprocess.run(["node", "--max-old-space-size=4096", script, "bundle", tmp], check=True)
+
+
+def run_load(args):
+    """이력 크기별 첫 카드까지의 시간. 첫 화면이 보이는 7일치가 차도록 오늘부터 만든다."""
+    today = datetime.datetime.now(app.KST).date().isoformat()
+    for rows in args.rows:
+        run_dashboard("load", args, rows, start=today)
+
+
+def run_search(args):
+    run_dashboard("search", args)
+
+
+def run_feed(args):
+    run_dashboard("feed", args)
+
+
+def history_rows(n: int, seed: int = 0, start: str = "2025-12-19", per_day: int = 200):
+    """data.csv 처럼 오래된 날짜부터 덧붙여 온 가짜 이력 n건 (하루 per_day 건).
+
+    약 4%는 앞선 기사와 링크가 같은 중복이고, 최근 사흘 치만 유사 기사 묶음이 비어 있다.
+    분류는 재지 않으므로 위험도는 무작위로 둔다.
+    """
+    rng = random.Random(seed)
+    day0 = datetime.date.fromisoformat(start)
+    for i in range(n):
+        j = i - rng.randint(1, 400) if i > 400 and rng.random() < 0.04 else i
+        yield {
+            "keyword": rng.choice(app.KEYWORDS),
+            "title": f"{' '.join(rng.sample(TITLE_WORDS, rng.randint(4, 7)))} ({seed}-{i})",
+            "link": f"https://news.example.com/article/{seed}/{j}?f=p",
+            "date": (day0 - datetime.timedelta(days=(n - 1 - i) // per_day)).isoformat(),
+            "risk": rng.choice(app.RISK_LEVELS),
+            "rules": "",
+            "cluster_id": "" if i >= n - 3 * per_day else f"c{i // 3}",
+        }
+
+
+COMPACT_CHILD = """
+import json, sys
+import app
+app.main(json.loads(sys.argv[1]))
+print(json.dumps(app.peak_rss()))
+"""
+
+
+def run_compact(args):
+    """이력 크기별로 python app.py --compact --retention-days 를 별도 프로세스로 돌려
+    최대 메모리가 --rss-ceiling 아래인지 본다. 넘는 크기가 있으면 종료 코드 1."""
+    today = datetime.datetime.now(app.KST).date().isoformat()
+    over = []
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory(dir=args.tmp) as tmp:
+            data = os.path.join(tmp, app.DATA_FILE)
+            started = time.perf_counter()
+            app.save_csv(history_rows(rows, start=today), data)
+            size = os.path.getsize(data)
+            print(f"write  rows={rows:<9} {size / 1e6:9.1f}MB {time.perf_counter() - started:8.1f}s")
+            argv = ["--compact", "--retention-days", str(args.retention_days), "-o", data,
+                    "--partition-dir", os.path.join(tmp, app.PARTITION_DIR),
+                    "--index-file", os.path.join(tmp, "index.db"), "--site-dir", tmp]
+            started = time.perf_counter()
+            out = subprocess.run([sys.executable, "-c", COMPACT_CHILD, json.dumps(argv)],
+                                 cwd=HERE, check=True, capture_output=True, text=True).stdout
+            elapsed = time.perf_counter() - started
+            peak = json.loads(out.splitlines()[-1]) / 1e6
+            manifest = app.load_manifest(os.path.join(tmp, app.PARTITION_DIR))
+            rollup_days = (manifest["rollups"] or {}).get("days", 0)
+            ok = peak <= args.rss_ceiling
+            if not ok:
+                over.append(rows)
+            print(f"compact rows={rows:<9} {elapsed:8.1f}s  kept={manifest['total']:<8} "
+                  f"rollup_days={rollup_days:<5} peak_rss={peak:7.1f}MB "
+                  f"{'ok' if ok else 'OVER %dMB' % args.rss_ceiling}")
+    if over:
+        sys.exit(1)
+
+
+def run_generate(args):
+    """크기별 합성 data.csv 와 파티션을 out/<rows>/ 에 만든다 (대시보드를 직접 띄워 볼 때)."""
+    today = datetime.datetime.now(app.KST).date().isoformat()
+    for rows in args.rows:
+        root = os.path.join(args.out, size_label(rows))
+        os.makedirs(root, exist_ok=True)
+        started = time.perf_counter()
+        write_dataset(root, rows, args.csv_only, start=today)
+        print(f"build  rows={rows:<8} {time.perf_counter() - started:7.2f}s  -> {root}")
+
+
+def size_label(rows: int) -> str:
+    for unit, scale in (("m", 1000000), ("k", 1000)):
+        if rows >= scale and rows % scale == 0:
+            return f"{rows // scale}{unit}"
+    return str(rows)
+
+
+def suite_crawl(args) -> Dict[str, float]:
+    """기록된 검색 결과 페이지로 app.run 한 번(수집~파티션 갱신)의 단계별 시간."""
+    today = datetime.datetime.now(app.KST).date().isoformat()
+    with tempfile.TemporaryDirectory() as tmp, \
+            StubNewsServer(latency=args.latency, recorded=True) as server:
+        keywords_file = os.path.join(tmp, "keywords.txt")
+        with open(keywords_file, "w", encoding="utf-8") as f:
+            f.writelines(f"키워드{i}\n" for i in range(args.keywords))
+        data = os.path.join(tmp, app.DATA_FILE)
+        app.save_csv(synthetic_rows(args.history, start=today), data)
+        run_args = app.parse_args([
+            "-k", keywords_file, "-w", str(args.workers), "--per-host", str(args.workers),
+            "--rate", "0", "--search-url", server.search_url, "-o", data,
+            "--partition-dir", os.path.join(tmp, app.PARTITION_DIR),
+            "--index-file", os.path.join(tmp, "index.db"),
+            "--cache-file", os.path.join(tmp, "cache.json"),
+        ])
+        report = app.RunReport()
+        started = time.perf_counter()
+        app.run(run_args, report)
+        elapsed = time.perf_counter() - started
+    result = report.to_dict()
+    assert result["status"] == "ok", result
+    metrics = {"crawl.total": elapsed}
+    metrics.update((f"crawl.{name}", stage["seconds"])
+                   for name, stage in result["stages"].items() if name != "crawl")
+    return metrics
+
+
+def suite_history(rows: int, args) -> Dict[str, float]:
+    """이력 rows 건에 대한 분류, 중복 제거 색인 구성/추가, 파티션 쓰기, index.html 생성과
+    대시보드 렌더링 시간."""
+    today = datetime.datetime.now(app.KST).date().isoformat()
+    label = size_label(rows)
+    metrics = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        history = list(synthetic_rows(rows, start=today))
+        titles = [row["title"] for row in history]
+        classifier = app.get_classifier()
+        started = time.perf_counter()
+        for i in range(0, len(titles), 10000):
+            classifier.classify_batch(titles[i:i + 10000])
+        metrics[f"classify.{label}"] = time.perf_counter() - started
+
+        data = os.path.join(tmp, app.DATA_FILE)
+        app.save_csv(history, data)
+        del history, titles
+        started = time.perf_counter()
+        index = app.DedupIndex(os.path.join(tmp, "index.db"), data)
+        metrics[f"dedup.build.{label}"] = time.perf_counter() - started
+        fresh = list(synthetic_rows(args.batch // 2, seed=rows + 1, start=today))
+        dupes = list(synthetic_rows(args.batch - len(fresh), start=today))
+        started = time.perf_counter()
+        new_rows = index.filter_new(fresh + dupes)
+        index.assign_clusters(new_rows)
+        app.append_csv(new_rows, data)
+        index.add(new_rows)
+        metrics[f"dedup.append.{label}"] = time.perf_counter() - started
+        index.close()
+
+        started = time.perf_counter()
+        manifest = app.rebuild_partitions(app.read_csv(data), os.path.join(tmp, app.PARTITION_DIR), data)
+        metrics[f"emit.{label}"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        dashboard_build.render(tmp, manifest, None, app.KEYWORD_GROUPS)
+        metrics[f"page.{label}"] = time.perf_counter() - started
+
+        if shutil.which("node"):
+            script = os.path.join(HERE, "bench_dashboard.js")
+            out = subprocess.run(["node", "--max-old-space-size=4096", script, "render", tmp],
+                                 check=True, capture_output=True, text=True).stdout
+            render = json.loads(out.strip().splitlines()[-1])
+            for key in ("first_card", "load", "filter"):
+                metrics[f"render.{key}.{label}"] = render[key]
+    return metrics
+
+
+def best_of(repeat: int, measure) -> Dict[str, float]:
+    """measure() 를 repeat 번 돌려 항목별 최솟값을 고른다 (잡음은 느린 쪽으로만 낀다)."""
+    best: Dict[str, float] = {}
+    for _ in range(max(1, repeat)):
+        for name, value in measure().items():
+            best[name] = min(value, best.get(name, value))
+    return best
+
+
+def load_baseline(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"metrics": {}}
+
+
+def compare(metrics: Dict[str, float], baseline: Dict[str, float], threshold: float):
+    """기준값 대비 변화를 출력하고 회귀한 항목 이름을 돌려준다."""
+    regressions = []
+    for name, value in metrics.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<26} {'-':>10} {value:10.4f}s  (기준값 없음)")
+            continue
+        change = (value - base) / base if base else 0.0
+        slower = change > threshold and value - base > MIN_DELTA
+        if name in INFO_METRICS:
+            note = "  (참고)"
+        elif slower:
+            regressions.append(name)
+            note = "  << 회귀"
+        else:
+            note = ""
+        print(f"{name:<26} {base:10.4f}s {value:10.4f}s  {change:+7.1%}{note}")
+    return regressions
+
+
+def run_suite(args):
+    if not shutil.which("node"):
+        print("node 가 없어 대시보드 렌더링(render.*) 항목은 건너뜁니다.")
+    app.log.setLevel(logging.WARNING)
+    metrics = best_of(args.repeat, lambda: suite_crawl(args))
+    for rows in args.sizes:
+        metrics.update(best_of(args.repeat, lambda: suite_history(rows, args)))
+
+    baseline = load_baseline(args.baseline)
+    threshold = args.threshold if args.threshold is not None \
+        else baseline.get("threshold", REGRESSION_THRESHOLD)
+    print(f"{'항목':<24} {'기준값':>9} {'이번':>10}  변화 (회귀 기준 +{threshold:.0%})")
+    regressions = compare(metrics, baseline["metrics"], threshold)
+
+    if args.save_baseline:
+        baseline["metrics"].update((name, round(value, 4)) for name, value in metrics.items())
+        baseline.update({
+            "recorded": datetime.date.today().isoformat(),
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} cpu",
+            "threshold": threshold,
+        })
+        baseline["metrics"] = dict(sorted(baseline["metrics"].items()))
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=1)
+            f.write("\n")
+        print(f"기준값 저장: {args.baseline}")
+    elif regressions:
+        print(f"회귀 {len(regressions)}건: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = p.add_subparsers(dest="suite", required=True)
+
+    c = sub.add_parser("crawl", help="스텁 서버 상대 수집 처리량과 캐시 효과")
+    c.add_argument("-n", "--keywords", type=int, default=200)
+    c.add_argument("-w", "--workers", type=int, nargs="+", default=[1, 8, 32])
+    c.add_argument("--latency", type=float, default=0.1)
+    c.set_defaults(func=run_crawl)
+
+    a = sub.add_parser("append", help="누적 이력 크기별 data.csv 추가 비용")
+    a.add_argument("--history", type=int, nargs="+", default=[1000, 100000, 1000000])
+    a.add_argument("--batch", type=int, default=200)
+    a.add_argument("--repeat", type=int, default=5, help="크기마다 추가해 볼 횟수 (중앙값)")
+    a.add_argument("--max-slowdown", type=float, default=APPEND_SLOWDOWN,
+                   help="가장 작은 이력 대비 가장 큰 이력의 추가 시간 상한 (배)")
+    a.set_defaults(func=run_append)
+
+    e = sub.add_parser("enrich", help="기사 본문 보강(받기 + 파싱) 처리량")
+    e.add_argument("-n", "--articles", type=int, default=400)
+    e.add_argument("--hosts", type=int, default=4, help="가짜 언론사 수")
+    e.add_argument("-w", "--workers", type=int, default=16, help="본문 수집 스레드 수")
+    e.add_argument("--per-host", type=int, default=4)
+    e.add_argument("-p", "--processes", type=int, nargs="+",
+                   default=[0, app.ENRICH_PROCESSES], help="파싱 프로세스 수 (0 = 현재 프로세스)")
+    e.add_argument("--latency", type=float, default=0.02)
+    e.set_defaults(func=run_enrich)
+
+    k = sub.add_parser("classify", help="위험도 분류 처리량 (규칙 수별)")
+    k.add_argument("-n", "--headlines", type=int, default=1000000)
+    k.add_argument("--extra-rules", type=int, nargs="+", default=[0, 1000, 10000],
+                   help="risk_rules.json 에 더할 가상 규칙 수")
+    k.add_argument("--batch", type=int, default=10000)
+    k.set_defaults(func=run_classify)
+
+    s = sub.add_parser("search", help="대시보드 검색 입력 한 글자당 필터 지연 (node 필요)")
+    s.add_argument("--rows", type=int, default=100000)
+    s.set_defaults(func=run_search)
+
+    f = sub.add_parser("feed", help="필터 변경/스크롤 시 뉴스 피드 렌더링 시간 (node 필요)")
+    f.add_argument("--rows", type=int, default=100000)
+    f.add_argument("--csv-only", action="store_true",
+                   help="파티션 없이 data.csv 만 만들어 전체 로드 경로를 잰다")
+    f.set_defaults(func=run_feed)
+
+    lo = sub.add_parser("load", help="이력 크기별 첫 카드 표시·전체 로드 시간 (node 필요)")
+    lo.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    lo.add_argument("--csv-only", action="store_true",
+                    help="파티션 없이 data.csv 를 조각으로 스트리밍하는 경로를 잰다")
+    lo.set_defaults(func=run_load)
+
+    b = sub.add_parser("bundle", help="data.csv 대비 열 단위 묶음 크기와 파싱 시간 (node 필요)")
+    b.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    b.set_defaults(func=run_bundle)
+
+    h = sub.add_parser("shards", help="--shards N 수집+병합이 한 프로세스 결과와 같은지와 소요 시간")
+    h.add_argument("-n", "--keywords", type=int, default=2000)
+    h.add_argument("--shards", type=int, nargs="+", default=[1, 4])
+    h.add_argument("-w", "--workers", type=int, default=8)
+    h.add_argument("--latency", type=float, default=0.01)
+    h.add_argument("--history", type=int, default=1000, help="수집 전 data.csv 이력 건수")
+    h.set_defaults(func=run_shards)
+
+    m = sub.add_parser("compact", help="이력 크기별 --compact --retention-days 최대 메모리 상한 확인")
+    m.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000, 15000000],
+                   help="이력 건수 (기본의 15000000 은 약 2GB 로 메모리에 다 올릴 수 없는 크기를 "
+                   "확인한다, 20분 넘게 걸린다)")
+    m.add_argument("--retention-days", type=int, default=365)
+    m.add_argument("--rss-ceiling", type=float, default=COMPACT_RSS_CEILING,
+                   help="허용할 최대 메모리(MB) (기본 %(default)s)")
+    m.add_argument("--tmp", help="합성 이력을 쓸 폴더 (기본: 시스템 임시 폴더)")
+    m.set_defaults(func=run_compact)
+
+    g = sub.add_parser("generate", help="크기별 합성 data.csv 와 파티션 만들기")
+    g.add_argument("--rows", type=int, nargs="+", default=[1000, 100000, 1000000])
+    g.add_argument("-o", "--out", default="bench_data")
+    g.add_argument("--csv-only", action="store_true", help="data/ 파티션 없이 data.csv 만")
+    g.set_defaults(func=run_generate)
+
+    u = sub.add_parser("suite", help="수집~렌더링 전체 경로를 재고 기준값과 비교")
+    u.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000],
+                   help="이력 크기 (1000000 은 몇 분 걸린다)")
+    u.add_argument("-n", "--keywords", type=int, default=200)
+    u.add_argument("-w", "--workers", type=int, default=8)
+    u.add_argument("--latency", type=float, default=0.01)
+    u.add_argument("--history", type=int, default=1000, help="수집 전 data.csv 이력 건수")
+    u.add_argument("--batch", type=int, default=200, help="중복 제거 추가 건수")
+    u.add_argument("--repeat", type=int, default=3, help="반복 횟수 (항목별 최솟값)")
+    u.add_argument("--baseline", default=BASELINE_FILE)
+    u.add_argument("--threshold", type=float,
+                   help=f"회귀로 볼 느려짐 비율 (기본: 기준값 파일 값 또는 {REGRESSION_THRESHOLD})")
+    u.add_argument("--save-baseline", action="store_true",
+                   help="이번 측정값으로 기준값 파일을 갱신한다")
+    u.set_defaults(func=run_suite)
+
+    args = p.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+// index.html 대시보드 스크립트를 브라우저 없이 node 에서 돌려 시간을 잰다.
+//
+//   node bench_dashboard.js search <data-dir>
+//   node bench_dashboard.js feed <data-dir>
+//   node bench_dashboard.js bundle <data-dir>
+//   node bench_dashboard.js load <data-dir>
+//   node bench_dashboard.js render <data-dir>   # JSON 한 줄 (bench.py suite 용)
+//
+// <data-dir> 는 data.csv 와 app.py 가 만든 data/ 파티션, 그리고 dashboard_build.render 가
+// 만든 index.html 과 assets/ 가 있는 폴더다.
+// 페이지 스크립트와 (assets/ 의) worker 는 각자 vm 컨텍스트에서 돌고, 메시지는
+// structuredClone 한 뒤 다음 틱에 건넨다. worker 의 상대 경로는 브라우저처럼 worker
+// 파일 위치 기준으로 푼다.
+// bundle 은 같은 행을 담은 bench.csv 와 bench.bin(app.build_bundle) 을 읽는다.
+// 보통은 `python bench.py search` 가 합성 데이터를 만들어 이 스크립트를 부른다.
+"use strict";
+
+const fs = require("fs");
+const path = require("path");
+const vm = require("vm");
+const { performance } = require("perf_hooks");
+
+// --- 최소한의 DOM / 라이브러리 대역 -------------------------------------------
+
+let createdElements = 0;
+const CSV_CHUNK = 1 << 20;
+
+class FakeElement {
+    constructor(id) {
+        this.id = id;
+        this.top = 0;
+        this.style = {};
+        this.dataset = {};
+        this.children = [];
+        this.innerHTML = "";
+        this.textContent = "";
+        this.value = "";
+        this.className = "";
+        this.classList = { add() {}, remove() {}, toggle() {} };
+    }
+    appendChild(child) { this.children.push(child); return child; }
+    addEventListener() {}
+    querySelector() { return new FakeElement(); }
+    getBoundingClientRect() { return { top: this.top }; }
+    set innerHTML(html) { this._html = html; if (html === "") this.children = []; }
+    get innerHTML() { return this._html; }
+}
+
+function parseCsvText(text) {
+    text = text.replace(/^\uFEFF/, "");
+    const rows = [];
+    let row = [], field = "", quoted = false;
+    for (let i = 0; i < text.length; i++) {
+        const c = text[i];
+        if (quoted) {
+            if (c === '"' && text[i + 1] === '"') { field += '"'; i++; }
+            else if (c === '"') quoted = false;
+            else field += c;
+        } else if (c === '"') quoted = true;
+        else if (c === ",") { row.push(field); field = ""; }
+        else if (c === "\n" || c === "\r") {
+            if (c === "\r" && text[i + 1] === "\n") i++;
+            row.push(field); field = "";
+            if (row.some(v => v !== "")) rows.push(row);
+            row = [];
+        } else field += c;
+    }
+    if (field || row.length) { row.push(field); rows.push(row); }
+    const header = rows.shift() || [];
+    return rows.map(r => Object.fromEntries(header.map((h, i) => [h, r[i] || ""])));
+}
+
+// 라이브러리·네트워크 대역 (페이지와 worker 공용)
+function makeGlobals(root) {
+    // chunk 를 주면 PapaParse 스트리밍처럼 파일을 CSV_CHUNK 바이트씩 읽어 줄 단위로 끊고
+    // 조각마다 비동기로 넘긴다 (필드 안 줄바꿈은 없다고 본다)
+    const Papa = {
+        parse(url, cfg) {
+            const file = path.join(root, url);
+            if (!cfg.chunk) {
+                fs.readFile(file, "utf8", (err, text) => {
+                    if (err) cfg.error(err);
+                    else cfg.complete({ data: parseCsvText(text) });
+                });
+                return;
+            }
+            let fd;
+            try {
+                fd = fs.openSync(file, "r");
+            } catch (err) {
+                setTimeout(() => cfg.error(err), 0);
+                return;
+            }
+            const buf = Buffer.alloc(CSV_CHUNK);
+            let header = null, rest = Buffer.alloc(0);
+            const next = () => {
+                const n = fs.readSync(fd, buf, 0, CSV_CHUNK, null);
+                let data = Buffer.concat([rest, buf.subarray(0, n)]);
+                const cut = n ? data.lastIndexOf(10) + 1 : data.length;
+                rest = data.subarray(cut);
+                let text = data.subarray(0, cut).toString("utf8");
+                if (header === null) {
+                    header = text.slice(0, text.indexOf("\n") + 1);
+                    text = text.slice(header.length);
+                }
+                if (text) cfg.chunk({ data: parseCsvText(header + text) });
+                if (n) setTimeout(next, 0);
+                else { fs.closeSync(fd); cfg.complete(); }
+            };
+            setTimeout(next, 0);
+        }
+    };
+    const fetch = async url => {
+        try {
+            const buf = await fs.promises.readFile(path.join(root, url));
+            return {
+                ok: true, status: 200,
+                json: async () => JSON.parse(buf.toString("utf8")),
+                text: async () => buf.toString("utf8"),
+                body: new Blob([buf]).stream(),
+            };
+        } catch (err) {
+            return { ok: false, status: 404, json: async () => null };
+        }
+    };
+    return {
+        Papa, fetch, console, setTimeout, clearTimeout,
+        TextDecoder, DecompressionStream, Response,
+    };
+}
+
+const deliver = (target, data) => setTimeout(() => target.onmessage({ data: structuredClone(data) }), 0);
+
+// worker 스크립트를 별도 컨텍스트에서 돌리는 Worker 대역. 마지막으로 만든 것을
+// lastWorker 에 남겨 벤치마크가 worker 쪽 상태를 볼 수 있게 한다.
+let lastWorker = null;
+
+class FakeWorker {
+    constructor(url, root) {
+        const file = path.join(root, url);
+        const code = fs.readFileSync(file, "utf8");
+        const self = { postMessage: data => deliver(this, data) };
+        this.ctx = vm.createContext({ ...makeGlobals(path.dirname(file)), self, postMessage: self.postMessage, importScripts() {} });
+        vm.runInContext(code, this.ctx);
+        this.scope = self;
+        this.onmessage = null;
+        lastWorker = this;
+    }
+    postMessage(data) { deliver(this.scope, data); }
+}
+
+function makeContext(root) {
+    const elements = new Map();
+    const document = {
+        getElementById(id) {
+            if (!elements.has(id)) elements.set(id, new FakeElement(id));
+            return elements.get(id);
+        },
+        createElement(tag) { createdElements++; return new FakeElement(tag); },
+        querySelector: () => new FakeElement(),
+        querySelectorAll: () => [],
+    };
+    class Chart {
+        constructor(ctx, cfg) { this.data = cfg.data; this.options = cfg.options; }
+        update() {}
+        destroy() {}
+    }
+    const window = { innerHeight: 900, addEventListener() {} };
+    return vm.createContext({
+        ...makeGlobals(root), document, window, Chart,
+        Worker: class extends FakeWorker { constructor(url) { super(url, root); } },
+        requestAnimationFrame: cb => setTimeout(cb, 0),
+    });
+}
+
+// 다음 renderDashboard 호출(= worker 결과 도착)까지 기다린다
+function nextRender(ctx) {
+    return new Promise(resolve => {
+        const render = vm.runInContext("renderDashboard", ctx);
+        ctx.renderDashboard = result => {
+            ctx.renderDashboard = render;
+            render(result);
+            resolve(result);
+        };
+    });
+}
+
+// worker 가 받고 있는 파티션을 다 받은 뒤 한 번 더 필터를 돌려 그린다
+async function settle(ctx, worker) {
+    await vm.runInContext("loadChain", worker);
+    const rendered = nextRender(ctx);
+    vm.runInContext("applyFilter()", ctx);
+    await rendered;
+}
+
+// 페이지를 띄우고 기본 기간(7일)의 첫 카드가 그려질 때까지(firstMs), 그 기간을 다
+// 받을 때까지(rangeMs) 잰 뒤 전체 기간을 받아 둔다 (loadMs 는 여기까지의 시간)
+async function loadDashboard(root) {
+    const html = fs.readFileSync(path.join(root, "index.html"), "utf8");
+    const script = html.match(/<script>([\s\S]*?)<\/script>/)[1];
+    const snapshot = html.match(/<script id="snapshot" type="application\/json">([\s\S]*?)<\/script>/);
+    const ctx = makeContext(root);
+    if (snapshot) vm.runInContext('document.getElementById("snapshot")', ctx).textContent = snapshot[1];
+    const started = performance.now();
+    vm.runInContext(script, ctx);
+    const worker = lastWorker.ctx;
+    await nextRender(ctx);
+    const firstMs = performance.now() - started;
+    const firstFeed = vm.runInContext("feed.length", ctx);
+    await settle(ctx, worker);
+    const rangeMs = performance.now() - started;
+    const rendered = nextRender(ctx);
+    vm.runInContext('setDateFilter("ALL")', ctx);
+    await rendered;
+    await settle(ctx, worker);
+    return { ctx, worker, firstMs, firstFeed, rangeMs, loadMs: performance.now() - started };
+}
+
+function stats(samples) {
+    const sorted = [...samples].sort((a, b) => a - b);
+    const pick = q => sorted[Math.min(sorted.length - 1, Math.floor(q * sorted.length))];
+    return `median ${pick(0.5).toFixed(2)}ms  p95 ${pick(0.95).toFixed(2)}ms  max ${sorted[sorted.length - 1].toFixed(2)}ms`;
+}
+
+// --- 벤치마크 --------------------------------------------------------------
+
+const QUERIES = ["개인정보 유출", "랜섬웨어", "kt 통신사", "중대재해", "쿠팡 해킹", "없는검색어"];
+
+// 한 글자 입력마다 필터 요청부터 결과를 그릴 때까지의 시간, 그리고 디바운스 없이
+// 연달아 입력했을 때 worker 가 실제로 돌린 필터 수 (마지막 것만 돌아야 한다)
+async function benchSearch(root) {
+    const { ctx, worker, loadMs } = await loadDashboard(root);
+    const rows = vm.runInContext("rawData.length", worker);
+    console.log(`load   rows=${rows}  ${loadMs.toFixed(0)}ms`);
+
+    const input = vm.runInContext('document.getElementById("filter-search")', ctx);
+    for (const [label, ready] of [["index", true], ["scan", false]]) {
+        vm.runInContext(`searchIndexReady = ${ready}`, worker);
+        const samples = [];
+        for (const q of QUERIES) {
+            for (let i = 1; i <= q.length; i++) {
+                input.value = q.slice(0, i);
+                const rendered = nextRender(ctx);
+                const t = performance.now();
+                vm.runInContext("applyFilter()", ctx);
+                await rendered;
+                samples.push(performance.now() - t);
+            }
+        }
+        console.log(`search ${label.padEnd(5)} keystrokes=${samples.length}  ${stats(samples)}`);
+
+        // 같은 입력에서 worker 의 행 고르기(filterRows)만. 집계·피드·그리기는 두 방식이 같다
+        const picks = [];
+        for (const q of QUERIES) {
+            for (let i = 1; i <= q.length; i++) {
+                const code = `filterRows("ALL", "ALL", ${JSON.stringify(q.slice(0, i).toLowerCase())}, "").length`;
+                const t = performance.now();
+                vm.runInContext(code, worker);
+                picks.push(performance.now() - t);
+            }
+        }
+        console.log(`rows   ${label.padEnd(5)} keystrokes=${picks.length}  ${stats(picks)}`);
+    }
+
+    vm.runInContext("searchIndexReady = true; runs = 0; const runFilter0 = runFilter; runFilter = msg => { runs++; return runFilter0(msg); }", worker);
+    let sent = 0;
+    const t = performance.now();
+    for (const q of QUERIES) {
+        const rendered = nextRender(ctx);
+        for (let i = 1; i <= q.length; i++) {
+            input.value = q.slice(0, i);
+            vm.runInContext("applyFilter()", ctx);
+            sent++;
+        }
+        await rendered;
+    }
+    const runs = vm.runInContext("runs", worker);
+    console.log(`typing requests=${sent}  filters run=${runs}  ${(performance.now() - t).toFixed(1)}ms`);
+}
+
+// 필터 변경마다 피드를 다시 그리는 시간과 만들어진 DOM 노드 수, 스크롤 시 창 갱신 시간
+const FILTER_STEPS = [
+    ["전체 기간", 'setDateFilter("ALL")'],
+    ["그룹", 'setKeywordFilter("GROUP:보안/기타", null)'],
+    ["키워드", 'setKeywordFilter("해킹", null)'],
+    ["위험도", 'setRiskFilter("RED")'],
+    ["3일", 'setDateFilter("3")'],
+    ["초기화", "resetFilter()"],
+    ["전체 기간", 'setDateFilter("ALL")'],
+];
+
+async function benchFeed(root) {
+    const { ctx, worker, loadMs } = await loadDashboard(root);
+    const rows = vm.runInContext("rawData.length", worker);
+    console.log(`load   rows=${rows}  ${loadMs.toFixed(0)}ms`);
+
+    for (const [label, code] of FILTER_STEPS) {
+        const before = createdElements;
+        const rendered = nextRender(ctx);
+        const t = performance.now();
+        vm.runInContext(code, ctx);
+        await rendered;
+        const ms = performance.now() - t;
+        const shown = vm.runInContext("feed.length", ctx);
+        console.log(`filter ${label.padEnd(6)} feed=${String(shown).padEnd(7)} ${ms.toFixed(2)}ms  new nodes=${createdElements - before}`);
+    }
+
+    // 스크롤마다 창 갱신(UI 스레드) 시간을 재고, 받아 둔 구간을 벗어나 worker 에 요청한
+    // 구간이 있으면 도착해서 다시 그려질 때까지 기다린다
+    const list = vm.runInContext('document.getElementById("news-list")', ctx);
+    const samples = [];
+    const before = createdElements;
+    let slices = 0;
+    for (let y = 0; y < 200000; y += 700) {
+        list.top = -y;
+        const t = performance.now();
+        vm.runInContext("updateFeedWindow()", ctx);
+        samples.push(performance.now() - t);
+        if (vm.runInContext("feed.pending", ctx)) slices++;
+        while (vm.runInContext("feed.pending", ctx)) await new Promise(r => setTimeout(r, 0));
+    }
+    const pool = vm.runInContext("feed.pool.length", ctx);
+    console.log(`scroll steps=${samples.length}  ${stats(samples)}  pool=${pool} new nodes=${createdElements - before}  slices=${slices}`);
+}
+
+// 같은 행을 CSV(parseCsv)와 열 단위 묶음(fetchBundle)으로 읽어 정렬까지 마치는 시간.
+// CSV 쪽은 PapaParse 대신 위의 parseCsvText 로 파싱한다.
+async function benchBundle(root) {
+    // 페이지 없이 worker 만 띄운다 (data.csv 가 없으니 로드는 보내지 않는다)
+    const html = fs.readFileSync(path.join(root, "index.html"), "utf8");
+    const url = html.match(/WORKER_URL = "([^"]+)"/)[1];
+    const { ctx } = new FakeWorker(url, root);
+    vm.runInContext(`dataRoot = "${"../".repeat(url.split("/").length - 1)}"`, ctx);
+    const loaders = {
+        csv: 'parseCsv(dataRoot + "bench.csv").then(items => items.filter(isValidItem))',
+        bundle: 'fetchBundle(dataRoot + "bench.bin").then(items => items.filter(isValidItem))',
+    };
+    const results = {};
+    for (const [label, code] of Object.entries(loaders)) {
+        const samples = [];
+        for (let i = 0; i < 3; i++) {
+            results[label] = null;
+            const t = performance.now();
+            results[label] = await vm.runInContext(code, ctx);
+            samples.push(performance.now() - t);
+        }
+        console.log(`parse  ${label.padEnd(6)} rows=${String(results[label].length).padEnd(8)} ${stats(samples)}`);
+    }
+    const same = results.csv.length === results.bundle.length && results.csv.every((a, i) => {
+        const b = results.bundle[i];
+        return a.title === b.title && a.link === b.link && a.date === b.date && a.day === b.day
+            && a.keyword === b.keyword && a.risk === b.risk && a.rules === b.rules && a.cluster === b.cluster;
+    });
+    console.log(`check  bundle rows ${same ? "match" : "DIFFER FROM"} csv`);
+    if (!same) process.exitCode = 1;
+}
+
+async function benchLoad(root) {
+    const { worker, firstMs, firstFeed, rangeMs, loadMs } = await loadDashboard(root);
+    const rows = vm.runInContext("rawData.length", worker);
+    console.log(`load   rows=${String(rows).padEnd(8)} first card ${firstMs.toFixed(0)}ms (feed=${firstFeed})  ` +
+                `7일 ${rangeMs.toFixed(0)}ms  전체 ${loadMs.toFixed(0)}ms`);
+}
+
+// bench.py suite 가 기준값과 비교할 수 있도록 페이지 로드·필터 시간을 JSON 한 줄(초 단위)로 낸다
+async function benchRender(root) {
+    const { ctx, worker, firstMs, rangeMs, loadMs } = await loadDashboard(root);
+    const samples = [];
+    for (const [, code] of FILTER_STEPS) {
+        const rendered = nextRender(ctx);
+        const t = performance.now();
+        vm.runInContext(code, ctx);
+        await rendered;
+        samples.push(performance.now() - t);
+    }
+    samples.sort((a, b) => a - b);
+    console.log(JSON.stringify({
+        rows: vm.runInContext("rawData.length", worker),
+        first_card: firstMs / 1000,
+        range: rangeMs / 1000,
+        load: loadMs / 1000,
+        filter: samples[samples.length >> 1] / 1000,
+    }));
+}
+
+const SUITES = { search: benchSearch, feed: benchFeed, bundle: benchBundle, load: benchLoad, render: benchRender };
+
+async function main() {
+    const [suite, root] = process.argv.slice(2);
+    if (!SUITES[suite] || !root) {
+        console.error(`usage: node bench_dashboard.js <${Object.keys(SUITES).join("|")}> <data-dir>`);
+        process.exit(2);
+    }
+    await SUITES[suite](path.resolve(root));
+}
+
+main().catch(err => { console.error(err); process.exit(1); });
@@ -0,0 +1,495 @@
+# -*- coding: utf-8 -*-
+"""templates/index.html 로 대시보드 index.html 을 만든다.
+
+app.py 가 수집·파티션 갱신 뒤에 부른다 (python app.py --render 로 따로 돌릴 수도 있다).
+
+- manifest.json 과 실행 보고서를 페이지에 JSON 으로 넣어 worker 가 manifest 를
+  따로 받지 않게 하고, 갱신 시각·전체 건수는 HTML 에 바로 찍는다.
+- 브라우저에서 CSS 를 컴파일하던 Tailwind Play CDN 대신, 템플릿에 실제로 나오는
+  유틸리티 클래스만 골라 만든 정적 CSS(assets/dashboard.<hash>.css)를 쓴다.
+- dashboard_worker.js 와 vendor/ 에 받아 둔 라이브러리는 내용 해시를 붙여
+  assets/ 에 복사한다. 받아 두지 않은 라이브러리는 CDN 주소를 그대로 쓴다.
+- HTML/CSS/JS 는 뜻이 바뀌지 않는 범위(주석, 들여쓰기, 연속 공백)에서 줄인다.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+log = logging.getLogger("crawler")
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_FILE = os.path.join(HERE, "templates", "index.html")
+WORKER_FILE = os.path.join(HERE, "dashboard_worker.js")
+VENDOR_DIR = os.path.join(HERE, "vendor")
+ASSET_DIR = "assets"
+
+# 받아 둘 라이브러리: vendor/ 파일 이름 -> 원래 CDN 주소 (템플릿과 worker 에 적힌 그대로)
+VENDOR_ASSETS = {
+    "chart.umd.min.js": "https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.min.js",
+    "papaparse.min.js": "https://cdnjs.cloudflare.com/ajax/libs/PapaParse/5.4.1/papaparse.min.js",
+}
+
+PLACEHOLDER_RE = re.compile(r"\{\{\s*([\w:.\-]+)\s*\}\}")
+
+
+# --- 유틸리티 CSS -----------------------------------------------------------
+
+COLORS = {
+    "white": "#ffffff", "black": "#000000",
+    "slate": ["#f8fafc", "#f1f5f9", "#e2e8f0", "#cbd5e1", "#94a3b8",
+              "#64748b", "#475569", "#334155", "#1e293b", "#0f172a"],
+    "blue": ["#eff6ff", "#dbeafe", "#bfdbfe", "#93c5fd", "#60a5fa",
+             "#3b82f6", "#2563eb", "#1d4ed8", "#1e40af", "#1e3a8a"],
+    "red": ["#fef2f2", "#fee2e2", "#fecaca", "#fca5a5", "#f87171",
+            "#ef4444", "#dc2626", "#b91c1c", "#991b1b", "#7f1d1d"],
+    "amber": ["#fffbeb", "#fef3c7", "#fde68a", "#fcd34d", "#fbbf24",
+              "#f59e0b", "#d97706", "#b45309", "#92400e", "#78350f"],
+    "green": ["#f0fdf4", "#dcfce7", "#bbf7d0", "#86efac", "#4ade80",
+              "#22c55e", "#16a34a", "#15803d", "#166534", "#14532d"],
+}
+SHADES = ["50", "100", "200", "300", "400", "500", "600", "700", "800", "900"]
+
+FONT_SIZES = {
+    "xs": ("0.75rem", "1rem"), "sm": ("0.875rem", "1.25rem"), "base": ("1rem", "1.5rem"),
+    "lg": ("1.125rem", "1.75rem"), "xl": ("1.25rem", "1.75rem"),
+    "2xl": ("1.5rem", "2rem"), "3xl": ("1.875rem", "2.25rem"),
+}
+RADII = {"": "0.25rem", "-md": "0.375rem", "-lg": "0.5rem", "-xl": "0.75rem",
+         "-2xl": "1rem", "-full": "9999px", "-none": "0px"}
+SHADOWS = {
+    "-sm": "0 1px 2px 0 rgb(0 0 0 / 0.05)",
+    "": "0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)",
+    "-md": "0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)",
+    "-lg": "0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)",
+    "-xl": "0 20px 25px -5px rgb(0 0 0 / 0.1), 0 8px 10px -6px rgb(0 0 0 / 0.1)",
+}
+BLURS = {"sm": "4px", "": "8px", "md": "12px", "lg": "16px", "xl": "24px", "2xl": "40px", "3xl": "64px"}
+SCREENS = {"sm": "640px", "md": "768px", "lg": "1024px", "xl": "1280px"}
+MAX_WIDTHS = {"md": "28rem", "lg": "32rem", "xl": "36rem", "2xl": "42rem", "4xl": "56rem",
+              "5xl": "64rem", "6xl": "72rem", "7xl": "80rem", "full": "100%"}
+KEYFRAMES = {
+    "spin": ("@keyframes spin{to{transform:rotate(360deg)}}", "spin 1s linear infinite"),
+    "ping": ("@keyframes ping{75%,100%{transform:scale(2);opacity:0}}",
+             "ping 1s cubic-bezier(0,0,0.2,1) infinite"),
+    "pulse": ("@keyframes pulse{50%{opacity:.5}}", "pulse 2s cubic-bezier(0.4,0,0.6,1) infinite"),
+}
+EASE = "transition-timing-function:cubic-bezier(0.4,0,0.2,1);transition-duration:150ms"
+
+# Tailwind preflight 중 이 페이지에 영향이 있는 부분
+PREFLIGHT = """
+*,::before,::after{box-sizing:border-box;border-width:0;border-style:solid;border-color:#e5e7eb;--tw-translate-x:0;--tw-translate-y:0}
+html{line-height:1.5;-webkit-text-size-adjust:100%;tab-size:4;font-family:ui-sans-serif,system-ui,sans-serif}
+body{margin:0;line-height:inherit}
+h1,h2,h3,h4,h5,h6{font-size:inherit;font-weight:inherit}
+a{color:inherit;text-decoration:inherit}
+b,strong{font-weight:bolder}
+button,input,select,textarea{font-family:inherit;font-size:100%;font-weight:inherit;line-height:inherit;color:inherit;margin:0;padding:0}
+button{background-color:transparent;background-image:none;cursor:pointer}
+blockquote,dl,dd,h1,h2,h3,h4,h5,h6,hr,figure,p,pre{margin:0}
+ol,ul{list-style:none;margin:0;padding:0}
+input::placeholder{opacity:1;color:#9ca3af}
+img,svg,video,canvas{display:block;vertical-align:middle}
+img,video{max-width:100%;height:auto}
+[hidden]{display:none}
+"""
+
+STATIC = {
+    "block": "display:block", "inline-block": "display:inline-block", "inline": "display:inline",
+    "flex": "display:flex", "inline-flex": "display:inline-flex", "grid": "display:grid",
+    "hidden": "display:none",
+    "static": "position:static", "fixed": "position:fixed", "absolute": "position:absolute",
+    "relative": "position:relative", "sticky": "position:sticky",
+    "flex-row": "flex-direction:row", "flex-col": "flex-direction:column", "flex-wrap": "flex-wrap:wrap",
+    "flex-1": "flex:1 1 0%", "shrink-0": "flex-shrink:0", "grow": "flex-grow:1",
+    "items-start": "align-items:flex-start", "items-end": "align-items:flex-end",
+    "items-center": "align-items:center", "self-center": "align-self:center",
+    "justify-start": "justify-content:flex-start", "justify-end": "justify-content:flex-end",
+    "justify-center": "justify-content:center", "justify-between": "justify-content:space-between",
+    "overflow-hidden": "overflow:hidden", "overflow-auto": "overflow:auto",
+    "truncate": "overflow:hidden;text-overflow:ellipsis;white-space:nowrap",
+    "line-clamp-2": "overflow:hidden;display:-webkit-box;-webkit-box-orient:vertical;-webkit-line-clamp:2",
+    "uppercase": "text-transform:uppercase", "underline": "text-decoration-line:underline",
+    "no-underline": "text-decoration-line:none",
+    "list-disc": "list-style-type:disc", "list-inside": "list-style-position:inside",
+    "font-normal": "font-weight:400", "font-medium": "font-weight:500",
+    "font-semibold": "font-weight:600", "font-bold": "font-weight:700", "font-extrabold": "font-weight:800",
+    "leading-none": "line-height:1", "leading-tight": "line-height:1.25", "leading-snug": "line-height:1.375",
+    "leading-normal": "line-height:1.5", "leading-relaxed": "line-height:1.625",
+    "tracking-tight": "letter-spacing:-0.025em", "tracking-wide": "letter-spacing:0.025em",
+    "tracking-wider": "letter-spacing:0.05em",
+    "text-left": "text-align:left", "text-center": "text-align:center", "text-right": "text-align:right",
+    "antialiased": "-webkit-font-smoothing:antialiased;-moz-osx-font-smoothing:grayscale",
+    "mx-auto": "margin-left:auto;margin-right:auto", "min-w-0": "min-width:0px",
+    "w-full": "width:100%", "h-full": "height:100%", "w-auto": "width:auto",
+    "inset-0": "inset:0px",
+    "border-dashed": "border-style:dashed", "border-none": "border-style:none",
+    "outline-none": "outline:2px solid transparent;outline-offset:2px",
+    "pointer-events-none": "pointer-events:none", "cursor-pointer": "cursor:pointer",
+    "transform": "transform:translate(var(--tw-translate-x),var(--tw-translate-y))",
+    "transition": "transition-property:color,background-color,border-color,opacity,box-shadow,transform;" + EASE,
+    "transition-all": "transition-property:all;" + EASE,
+    "transition-colors": "transition-property:color,background-color,border-color,text-decoration-color,fill,stroke;" + EASE,
+    "bg-gradient-to-r": "background-image:linear-gradient(to right,var(--tw-gradient-stops))",
+    "bg-gradient-to-br": "background-image:linear-gradient(to bottom right,var(--tw-gradient-stops))",
+}
+
+# 나오는 순서대로 CSS 에 쓴다 (뒤에 오는 규칙이 이긴다: border 다음 border-l-4, p 다음 px/pt)
+RULE_ORDER = [
+    "static", "position-offset", "z", "col-span", "margin", "size", "display-etc",
+    "grid-cols", "gap", "space", "rounded", "border-width", "border-color",
+    "bg", "gradient", "padding", "text-size", "text-color", "opacity", "shadow", "filter",
+]
+SPACING_PROPS = {
+    "p": ["padding"], "px": ["padding-left", "padding-right"], "py": ["padding-top", "padding-bottom"],
+    "pt": ["padding-top"], "pr": ["padding-right"], "pb": ["padding-bottom"], "pl": ["padding-left"],
+    "m": ["margin"], "mx": ["margin-left", "margin-right"], "my": ["margin-top", "margin-bottom"],
+    "mt": ["margin-top"], "mr": ["margin-right"], "mb": ["margin-bottom"], "ml": ["margin-left"],
+}
+BORDER_SIDES = {"": ["border-width"], "-t": ["border-top-width"], "-r": ["border-right-width"],
+                "-b": ["border-bottom-width"], "-l": ["border-left-width"],
+                "-x": ["border-left-width", "border-right-width"],
+                "-y": ["border-top-width", "border-bottom-width"]}
+
+
+def _spacing(value: str) -> Optional[str]:
+    if value == "0":
+        return "0px"
+    if value == "px":
+        return "1px"
+    if re.fullmatch(r"\d+(\.5)?", value):
+        return "%grem" % (float(value) / 4)
+    if re.fullmatch(r"\d+/\d+", value):
+        a, b = value.split("/")
+        return "%g%%" % round(int(a) / int(b) * 100, 6)
+    if value == "full":
+        return "100%"
+    return None
+
+
+def _rgb(hex_color: str) -> str:
+    return " ".join(str(int(hex_color[i:i + 2], 16)) for i in (1, 3, 5))
+
+
+def _color(name: str) -> Optional[Tuple]:
+    """'slate-800' 또는 'white/10' -> (hex, 알파 또는 None)."""
+    name, _, alpha = name.partition("/")
+    if alpha and not alpha.isdigit():
+        return None
+    if name in COLORS and isinstance(COLORS[name], str):
+        hex_color = COLORS[name]
+    else:
+        family, _, shade = name.rpartition("-")
+        if family not in COLORS or shade not in SHADES or isinstance(COLORS[family], str):
+            return None
+        hex_color = COLORS[family][SHADES.index(shade)]
+    return hex_color, (int(alpha) / 100 if alpha else None)
+
+
+def _color_decl(prop: str, var: str, value: Tuple) -> str:
+    hex_color, alpha = value
+    if alpha is not None:
+        return "%s:rgb(%s / %g)" % (prop, _rgb(hex_color), alpha)
+    return "--tw-%s:1;%s:rgb(%s / var(--tw-%s))" % (var, prop, _rgb(hex_color), var)
+
+
+def utility(name: str):
+    """유틸리티 클래스 하나 -> (RULE_ORDER 의 묶음, CSS 선언, 덧붙일 @keyframes). 모르면 None."""
+    if name in STATIC:
+        return "static", STATIC[name], None
+    m = re.fullmatch(r"animate-(\w+)", name)
+    if m and m.group(1) in KEYFRAMES:
+        frames, value = KEYFRAMES[m.group(1)]
+        return "static", "animation:" + value, frames
+    m = re.fullmatch(r"(-?)(top|right|bottom|left)-(.+)", name)
+    if m and _spacing(m.group(3)):
+        return "position-offset", "%s:%s%s" % (m.group(2), m.group(1), _spacing(m.group(3))), None
+    m = re.fullmatch(r"z-(\d+)", name)
+    if m:
+        return "z", "z-index:" + m.group(1), None
+    m = re.fullmatch(r"col-span-(\d+)", name)
+    if m:
+        return "col-span", "grid-column:span {0} / span {0}".format(m.group(1)), None
+    m = re.fullmatch(r"(p[xytrbl]?|m[xytrbl]?)-(.+)", name)
+    if m and _spacing(m.group(2)) and m.group(2) != "full":
+        decl = ";".join("%s:%s" % (p, _spacing(m.group(2))) for p in SPACING_PROPS[m.group(1)])
+        return ("padding" if m.group(1)[0] == "p" else "margin"), decl, None
+    m = re.fullmatch(r"(w|h)-(.+)", name)
+    if m and _spacing(m.group(2)):
+        return "size", "%s:%s" % ({"w": "width", "h": "height"}[m.group(1)], _spacing(m.group(2))), None
+    m = re.fullmatch(r"max-w-(.+)", name)
+    if m and m.group(1) in MAX_WIDTHS:
+        return "size", "max-width:" + MAX_WIDTHS[m.group(1)], None
+    m = re.fullmatch(r"grid-cols-(\d+)", name)
+    if m:
+        return "grid-cols", "grid-template-columns:repeat(%s,minmax(0,1fr))" % m.group(1), None
+    m = re.fullmatch(r"gap-(.+)", name)
+    if m and _spacing(m.group(1)):
+        return "gap", "gap:" + _spacing(m.group(1)), None
+    m = re.fullmatch(r"space-(x|y)-(.+)", name)
+    if m and _spacing(m.group(2)):
+        side = "margin-top" if m.group(1) == "y" else "margin-left"
+        return "space", "%s:%s" % (side, _spacing(m.group(2))), None
+    m = re.fullmatch(r"rounded(-\w+)?", name)
+    if m and (m.group(1) or "") in RADII:
+        return "rounded", "border-radius:" + RADII[m.group(1) or ""], None
+    m = re.fullmatch(r"border(-[trblxy])?(-\d+)?", name)
+    if m and (m.group(1) or "") in BORDER_SIDES:
+        width = (m.group(2) or "-1")[1:] + "px"
+        return "border-width", ";".join("%s:%s" % (p, width) for p in BORDER_SIDES[m.group(1) or ""]), None
+    m = re.fullmatch(r"(text|bg|border)-(.+)", name)
+    if m and _color(m.group(2)):
+        prop, var = {"text": ("color", "text-opacity"), "bg": ("background-color", "bg-opacity"),
+                     "border": ("border-color", "border-opacity")}[m.group(1)]
+        group = {"text": "text-color", "bg": "bg", "border": "border-color"}[m.group(1)]
+        return group, _color_decl(prop, var, _color(m.group(2))), None
+    m = re.fullmatch(r"(bg|text|border)-opacity-(\d+)", name)
+    if m:
+        return "opacity", "--tw-%s-opacity:%g" % (m.group(1), int(m.group(2)) / 100), None
+    m = re.fullmatch(r"(from|to)-(.+)", name)
+    if m and _color(m.group(2)):
+        hex_color = _color(m.group(2))[0]
+        if m.group(1) == "to":
+            return "gradient", "--tw-gradient-to:" + hex_color, None
+        return "gradient", ("--tw-gradient-from:%s;--tw-gradient-to:rgb(%s / 0);"
+                            "--tw-gradient-stops:var(--tw-gradient-from),var(--tw-gradient-to)"
+                            % (hex_color, _rgb(hex_color))), None
+    m = re.fullmatch(r"text-(\w+)", name)
+    if m and m.group(1) in FONT_SIZES:
+        return "text-size", "font-size:%s;line-height:%s" % FONT_SIZES[m.group(1)], None
+    m = re.fullmatch(r"text-\[(\d+(?:\.\d+)?(?:px|rem|em))\]", name)
+    if m:
+        return "text-size", "font-size:" + m.group(1), None
+    m = re.fullmatch(r"opacity-(\d+)", name)
+    if m:
+        return "opacity", "opacity:%g" % (int(m.group(1)) / 100), None
+    m = re.fullmatch(r"shadow(-\w+)?", name)
+    if m and (m.group(1) or "") in SHADOWS:
+        return "shadow", "box-shadow:" + SHADOWS[m.group(1) or ""], None
+    m = re.fullmatch(r"(backdrop-)?blur(?:-(\w+))?", name)
+    if m and (m.group(2) or "") in BLURS:
+        prop = "backdrop-filter" if m.group(1) else "filter"
+        return "filter", "%s:blur(%s)" % (prop, BLURS[m.group(2) or ""]), None
+    m = re.fullmatch(r"(-?)translate-(x|y)-(.+)", name)
+    if m and _spacing(m.group(3)):
+        return "filter", ("--tw-translate-%s:%s%s;transform:translate(var(--tw-translate-x),"
+                          "var(--tw-translate-y))" % (m.group(2), m.group(1), _spacing(m.group(3)))), None
+    return None
+
+
+def _escape_class(name: str) -> str:
+    return re.sub(r"([^A-Za-z0-9_-])", r"\\\1", name)
+
+
+def utility_css(candidates: Iterable[str]) -> str:
+    """후보 토큰 중 아는 유틸리티만 CSS 로 만든다 (hover:/focus:/group-hover:/md:/lg: 지원)."""
+    rules = []  # (화면 순서, 상태 변형 여부, 묶음 순서, 클래스, CSS)
+    keyframes = set()
+    for token in set(candidates):
+        *variants, base = token.split(":")
+        if len(variants) > 2:
+            continue
+        parsed = utility(base)
+        if not parsed:
+            continue
+        group, decl, frames = parsed
+        screen = None
+        selector = "." + _escape_class(token)
+        state = 0
+        for variant in variants:
+            if variant in SCREENS and screen is None:
+                screen = variant
+            elif variant in ("hover", "focus") and not state:
+                selector += ":" + variant
+                state = 1
+            elif variant == "group-hover" and not state:
+                selector = ".group:hover " + selector
+                state = 1
+            else:
+                break
+        else:
+            if group == "space":
+                selector += " > :not([hidden]) ~ :not([hidden])"
+            if frames:
+                keyframes.add(frames)
+            screen_order = list(SCREENS).index(screen) + 1 if screen else 0
+            rules.append((screen_order, state, RULE_ORDER.index(group), token,
+                          "%s{%s}" % (selector, decl), screen))
+    rules.sort()
+    out = [PREFLIGHT.strip()] + sorted(keyframes)
+    for screen in [None] + list(SCREENS):
+        block = [css for *_, css, s in rules if s == screen]
+        if not block:
+            continue
+        if screen:
+            out.append("@media (min-width:%s){%s}" % (SCREENS[screen], "".join(block)))
+        else:
+            out.extend(block)
+    return "\n".join(out) + "\n"
+
+
+def class_candidates(*texts: str) -> List[str]:
+    """클래스일 수 있는 토큰을 모두 뽑는다. JS 문자열 속 클래스도 잡히도록 따옴표 안을 가리지 않는다."""
+    tokens = set()
+    for text in texts:
+        tokens.update(re.findall(r"[A-Za-z0-9_:\-\[\]/.%]+", text))
+    return sorted(t.strip(".") for t in tokens if t)
+
+
+# --- 줄이기 -----------------------------------------------------------------
+
+def minify_css(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+def minify_js(js: str) -> str:
+    """줄 앞 들여쓰기, 빈 줄, 한 줄 전체가 // 주석인 줄만 지운다.
+
+    문자열 안의 // (URL 등)를 건드리지 않도록 줄 끝 주석은 두고, 줄바꿈도 그대로 둬서
+    세미콜론 자동 삽입 동작이 바뀌지 않게 한다.
+    """
+    lines = []
+    for line in js.splitlines():
+        line = line.strip()
+        if line and not line.startswith("//"):
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def minify_html(page: str) -> str:
+    """<script>/<style> 은 각각 줄이고, 나머지는 주석을 지우고 연속 공백을 하나로 줄인다."""
+    out = []
+    pos = 0
+    for m in re.finditer(r"(<(script|style)\b[^>]*>)(.*?)(</\2>)", page, flags=re.S | re.I):
+        out.append(_minify_markup(page[pos:m.start()]))
+        body = m.group(3)
+        if m.group(2).lower() == "style":
+            body = minify_css(body)
+        elif "application/json" not in m.group(1):
+            body = minify_js(body)
+        out.append(m.group(1) + body + m.group(4))
+        pos = m.end()
+    out.append(_minify_markup(page[pos:]))
+    return "".join(out).strip() + "\n"
+
+
+def _minify_markup(markup: str) -> str:
+    markup = re.sub(r"<!--(?!\[if).*?-->", "", markup, flags=re.S)
+    return re.sub(r"\s+", " ", markup)
+
+
+# --- 자산과 렌더링 ------------------------------------------------------------
+
+def fingerprint(name: str, content: bytes) -> str:
+    stem, ext = os.path.splitext(name)
+    return "%s.%s%s" % (stem, hashlib.sha1(content).hexdigest()[:10], ext)
+
+
+class AssetWriter:
+    """내용 해시를 붙인 이름으로 assets/ 에 쓰고, 이번에 쓰지 않은 옛 파일은 지운다."""
+
+    def __init__(self, site_dir: str):
+        self.dir = os.path.join(site_dir, ASSET_DIR)
+        self.written: Dict[str, str] = {}
+
+    def write(self, name: str, content: bytes) -> str:
+        os.makedirs(self.dir, exist_ok=True)
+        hashed = fingerprint(name, content)
+        path = os.path.join(self.dir, hashed)
+        if not os.path.exists(path):
+            with open(path + ".tmp", "wb") as f:
+                f.write(content)
+            os.replace(path + ".tmp", path)
+        self.written[name] = hashed
+        return ASSET_DIR + "/" + hashed
+
+    def prune(self):
+        keep = set(self.written.values())
+        for name in os.listdir(self.dir):
+            if name not in keep:
+                os.remove(os.path.join(self.dir, name))
+
+
+def vendored(assets: AssetWriter) -> Dict[str, str]:
+    """vendor/ 에 있는 라이브러리를 assets/ 로 복사하고 CDN 주소 -> 파일 이름 표를 돌려준다."""
+    urls = {}
+    for name, url in VENDOR_ASSETS.items():
+        path = os.path.join(VENDOR_DIR, name)
+        if not os.path.exists(path):
+            log.info("%s 가 vendor/ 에 없어 CDN 주소를 씁니다 (python app.py --vendor)", name)
+            continue
+        with open(path, "rb") as f:
+            urls[url] = assets.write(name, f.read()).split("/", 1)[1]
+    return urls
+
+
+def vendor(timeout: float = 30) -> List[str]:
+    """VENDOR_ASSETS 를 받아 vendor/ 에 저장한다 (네트워크 필요, 받은 파일은 커밋해 둔다)."""
+    import requests
+
+    os.makedirs(VENDOR_DIR, exist_ok=True)
+    saved = []
+    for name, url in VENDOR_ASSETS.items():
+        resp = requests.get(url, timeout=timeout)
+        resp.raise_for_status()
+        with open(os.path.join(VENDOR_DIR, name), "wb") as f:
+            f.write(resp.content)
+        saved.append(name)
+    return saved
+
+
+def _json_for_script(data) -> str:
+    # </script> 로 태그가 끝나지 않게 한다
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+
+
+def render(site_dir: str, manifest: Optional[dict], report: Optional[dict],
+           groups: Dict[str, List[str]], template_path: str = TEMPLATE_FILE,
+           minify: bool = True) -> str:
+    """site_dir 에 index.html 과 assets/ 를 쓰고 index.html 경로를 돌려준다.
+
+    groups 는 키워드 버튼 그룹(app.KEYWORD_GROUPS)으로, 페이지에 그대로 넣는다.
+    """
+    with open(template_path, encoding="utf-8") as f:
+        template = f.read()
+    with open(WORKER_FILE, encoding="utf-8") as f:
+        worker = f.read()
+
+    assets = AssetWriter(site_dir)
+    cdn = vendored(assets)
+    for url, hashed in cdn.items():
+        # worker 는 assets/ 안에서 돌므로 같은 폴더 기준 이름으로 바꾼다
+        worker = worker.replace(url, hashed)
+        template = template.replace(url, ASSET_DIR + "/" + hashed)
+    if minify:
+        worker = minify_js(worker) + "\n"
+
+    css = utility_css(class_candidates(template))
+    values = {
+        "css": assets.write("dashboard.css", (minify_css(css) if minify else css).encode("utf-8")),
+        "asset:dashboard_worker.js": assets.write("dashboard_worker.js", worker.encode("utf-8")),
+        "snapshot": _json_for_script({"manifest": manifest, "report": report, "groups": groups}),
+        "updated": (manifest or {}).get("updated", "-").replace("T", " ")[:16],
+        "total": "{:,}".format((manifest or {}).get("total", 0)),
+    }
+
+    def substitute(m):
+        if m.group(1) not in values:
+            raise KeyError("템플릿 자리표시 %r 에 넣을 값이 없습니다" % m.group(1))
+        return values[m.group(1)]
+
+    page = PLACEHOLDER_RE.sub(substitute, template)
+    if minify:
+        page = minify_html(page)
+    assets.prune()
+    path = os.path.join(site_dir, "index.html")
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(page)
+    os.replace(path + ".tmp", path)
+    return path